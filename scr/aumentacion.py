@@ -0,0 +1,122 @@
+"""
+aumentacion.py
+Aumentación de landmarks al vuelo, vectorizada por lote en NumPy, para entrenar el modelo
+sin grabar más video. Trabaja sobre arrays (B,21,3) ya normalizados (centrados en la muñeca
+y escalados, como dataset_landmarks_limpios) y aplica, por muestra:
+ - espejo izquierda/derecha (x -> -x)
+ - rotación 3D aleatoria
+ - escala por eje (cambios de proporción de la cámara)
+ - jitter gaussiano
+ - dropout de landmarks (el punto pasa a la muñeca, como un landmark perdido)
+
+Tras rotar/escalar/jitter se vuelve a normalizar con center_and_scale_batch para que las
+muestras aumentadas queden en la misma escala que ve el detector en vivo.
+"""
+
+import time
+import numpy as np
+
+from procesamiento_landmarks import center_and_scale_batch, N_LANDMARKS, N_FEATURES
+
+# -------------------------
+# Config
+# -------------------------
+PROB_ESPEJO = 0.5
+ROT_MAX_GRADOS = (15.0, 20.0, 20.0)   # rotación máxima alrededor de z (plano de imagen), y, x
+ESCALA_RANGO = (0.9, 1.1)             # escala por eje antes de renormalizar
+JITTER_STD = 0.01
+PROB_DROPOUT = 0.05
+BATCH_SIZE = 64                        # mismo batch que en 02_entrenamiento_modelo.ipynb
+
+
+def matrices_rotacion(rng, n, max_grados=ROT_MAX_GRADOS):
+    """Devuelve (n,3,3) matrices Rz·Ry·Rx con ángulos uniformes en ±max_grados."""
+    ang = np.deg2rad(rng.uniform(-1.0, 1.0, size=(n, 3)) * np.asarray(max_grados, dtype=np.float64))
+    c, s = np.cos(ang).astype(np.float32), np.sin(ang).astype(np.float32)
+    cz, cy, cx = c[:, 0], c[:, 1], c[:, 2]
+    sz, sy, sx = s[:, 0], s[:, 1], s[:, 2]
+    R = np.empty((n, 3, 3), dtype=np.float32)
+    R[:, 0, 0] = cz * cy
+    R[:, 0, 1] = cz * sy * sx - sz * cx
+    R[:, 0, 2] = cz * sy * cx + sz * sx
+    R[:, 1, 0] = sz * cy
+    R[:, 1, 1] = sz * sy * sx + cz * cx
+    R[:, 1, 2] = sz * sy * cx - cz * sx
+    R[:, 2, 0] = -sy
+    R[:, 2, 1] = cy * sx
+    R[:, 2, 2] = cy * cx
+    return R
+
+def aumentar_lote(X, rng, prob_espejo=PROB_ESPEJO, max_grados=ROT_MAX_GRADOS, escala=ESCALA_RANGO,
+                  jitter_std=JITTER_STD, prob_dropout=PROB_DROPOUT):
+    """X: (B,63) o (B,21,3) normalizado. Devuelve un nuevo array (B,63) float32 aumentado."""
+    pts = np.array(X, dtype=np.float32).reshape(-1, N_LANDMARKS, 3)
+    n = len(pts)
+
+    espejo = rng.random(n) < prob_espejo
+    pts[espejo, :, 0] *= -1.0
+
+    pts = np.einsum("bij,bkj->bki", matrices_rotacion(rng, n, max_grados), pts)
+    pts *= rng.uniform(escala[0], escala[1], size=(n, 1, 3)).astype(np.float32)
+    if jitter_std > 0:
+        pts += rng.normal(0.0, jitter_std, size=pts.shape).astype(np.float32)
+
+    out = center_and_scale_batch(pts.reshape(n, N_FEATURES)).reshape(n, N_LANDMARKS, 3)
+
+    if prob_dropout > 0:
+        perdidos = rng.random((n, N_LANDMARKS)) < prob_dropout
+        perdidos[:, 0] = False   # la muñeca es el origen, no tiene sentido "perderla"
+        out[perdidos] = 0.0
+    return out.reshape(n, N_FEATURES)
+
+
+class GeneradorAumentado:
+    """Lotes infinitos (x, y_one_hot) aumentados para model.fit:
+        gen = GeneradorAumentado(X_train, y_train, num_classes)
+        model.fit(gen.lotes(), steps_per_epoch=gen.steps_per_epoch, ...)
+    Keras 3 solo acepta generadores de Python reales (no iteradores propios), por eso se pasa
+    gen.lotes() y no gen. Baraja en cada época; si proporcion_original > 0 deja esa fracción
+    de cada lote sin aumentar.
+    """
+
+    def __init__(self, X, y, num_clases, batch_size=BATCH_SIZE, seed=42, proporcion_original=0.0, **kwargs_aumento):
+        self.X = np.asarray(X, dtype=np.float32).reshape(-1, N_FEATURES)
+        self.y = np.asarray(y, dtype=np.int32)
+        self.num_clases = num_clases
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.proporcion_original = proporcion_original
+        self.kwargs_aumento = kwargs_aumento
+        self._eye = np.eye(num_clases, dtype=np.float32)
+        self.steps_per_epoch = int(np.ceil(len(self.X) / batch_size))
+
+    def lotes(self):
+        """Generador de Python (types.GeneratorType) con lotes sin fin, para model.fit."""
+        while True:
+            yield next(self)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if not hasattr(self, "_orden") or self._pos >= len(self._orden):
+            self._orden = self.rng.permutation(len(self.X))
+            self._pos = 0
+        idx = self._orden[self._pos:self._pos + self.batch_size]
+        self._pos += self.batch_size
+
+        xb = aumentar_lote(self.X[idx], self.rng, **self.kwargs_aumento)
+        if self.proporcion_original > 0:
+            keep = self.rng.random(len(idx)) < self.proporcion_original
+            xb[keep] = self.X[idx[keep]]
+        return xb, self._eye[self.y[idx]]
+
+
+def medir_rendimiento(generador, n_lotes=200):
+    """Devuelve muestras aumentadas por segundo generando `n_lotes` lotes."""
+    muestras = 0
+    t0 = time.perf_counter()
+    for _ in range(n_lotes):
+        xb, _ = next(generador)
+        muestras += len(xb)
+    return muestras / (time.perf_counter() - t0)
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+benchmark_primitivas.py
+Micro-benchmarks de las primitivas del pipeline, con línea base guardada y umbral de regresión.
+Corre en CPU sin cámara: usa los CSV de dataset_landmarks, los .npy de dataset_landmarks_limpios
+y frames tomados de los clips de videos_proc.
+
+Casos:
+ - csv_parse:            read_landmark_csv sobre un CSV de dataset_landmarks
+ - csv_append_fila:      append_landmark_row (captura_video_descargado_landmark.py), una fila
+ - normalizacion_fila:   center_and_scale_vec, una fila (como el notebook)
+ - normalizacion_lote:   center_and_scale_batch sobre X_test
+ - zscore_limpieza:      remove_outliers_zscore sobre X_test
+ - keras_fila / keras_lote: inferencia de modelo_signos.h5 (se salta si no hay TensorFlow)
+ - knn_fila / knn_lote:  inferencia del índice de clasificador_knn.py
+ - preprocess_frame:     preprocess_frame sobre frames grabados (denoise + ecualización + resize)
+
+Uso (desde la raíz del repo):
+     python scr/benchmark_primitivas.py                   # compara contra la línea base
+     python scr/benchmark_primitivas.py --guardar         # guarda/actualiza la línea base
+     python scr/benchmark_primitivas.py --solo normalizacion_lote,zscore_limpieza
+
+Línea base: benchmarks/baseline_primitivas.json está versionada en el repo. Los tiempos dependen
+de la máquina, así que al cambiar de equipo de referencia (o tras una mejora intencional) se
+regenera con --guardar en ese equipo y se hace commit del JSON junto con el cambio.
+--guardar mide CORRIDAS_BASELINE veces cada caso y guarda la mediana. keras_fila / keras_lote
+solo se pueden guardar en un equipo con TensorFlow:
+     python scr/benchmark_primitivas.py --guardar --solo keras_fila,keras_lote
+
+Ruido: cada repetición de un caso se alterna con un bucle de calibración fijo (Python + NumPy)
+y se compara la mediana de tiempo_caso / tiempo_calibración, así una máquina más cargada o más
+lenta en ese momento no cuenta como regresión. Un caso que pasa la tolerancia se vuelve a
+medir (REINTENTOS) y solo es regresión si sigue por encima en todas las mediciones.
+
+Códigos de salida: 0 sin regresiones, 1 si algún caso es más lento que la línea base por encima
+de la tolerancia, 2 si no hay línea base (nada que comparar).
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import platform
+import argparse
+import numpy as np
+
+from procesamiento_landmarks import (
+    center_and_scale_vec, center_and_scale_batch, remove_outliers_zscore,
+    read_landmark_csv, load_clean_splits
+)
+
+# -------------------------
+# Config
+# -------------------------
+BASELINE_PATH = "benchmarks/baseline_primitivas.json"
+TOLERANCIA = 0.30            # 30% más lento que la línea base => regresión (ruido medido con calibración: hasta ~+25%)
+SAMPLE_CSV = "dataset_landmarks/A.csv"
+SAMPLE_CLIP = "videos_proc/A/clip_1.mp4"
+MODEL_PATH = "modelo/modelo_signos.h5"
+N_FRAMES_MUESTRA = 5
+TIEMPO_MIN_S = 0.2           # tiempo mínimo por repetición (se ajusta el número de llamadas)
+REPETICIONES = 7
+CORRIDAS_BASELINE = 5        # mediciones por caso al guardar la línea base (se guarda la mediana)
+REINTENTOS = 2               # mediciones extra de un caso que parece regresión
+
+
+def calibracion():
+    """Carga fija de referencia: un poco de bucle Python y un poco de NumPy, como los casos."""
+    total = 0.0
+    for i in range(2000):
+        total += i * 0.5
+    a = np.arange(20000, dtype=np.float32)
+    return total + float((a * a).sum())
+
+def _llamadas_para(fn, tiempo_min):
+    """Número de llamadas que tarda al menos tiempo_min (estilo timeit)."""
+    fn()  # calentamiento
+    llamadas = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(llamadas):
+            fn()
+        if time.perf_counter() - t0 >= tiempo_min or llamadas >= 1 << 20:
+            return llamadas
+        llamadas *= 2
+
+def _por_llamada(fn, llamadas):
+    t0 = time.perf_counter()
+    for _ in range(llamadas):
+        fn()
+    return (time.perf_counter() - t0) / llamadas
+
+def medir(fn, tiempo_min=TIEMPO_MIN_S, repeticiones=REPETICIONES):
+    """Mide fn alternando cada repetición con la calibración, para que ambas vean la misma carga
+       de la máquina. Devuelve {"seg": mínimo por llamada, "calibracion": mínimo de la calibración,
+       "relativo": mediana de seg/calibración por repetición}; la comparación usa "relativo".
+    """
+    n_fn = _llamadas_para(fn, tiempo_min)
+    n_cal = _llamadas_para(calibracion, tiempo_min / 2)
+    seg, cal = [], []
+    for _ in range(repeticiones):
+        seg.append(_por_llamada(fn, n_fn))
+        cal.append(_por_llamada(calibracion, n_cal))
+    seg, cal = np.asarray(seg), np.asarray(cal)
+    return {"seg": float(seg.min()), "calibracion": float(cal.min()), "relativo": float(np.median(seg / cal))}
+
+def ratio(actual, base):
+    """Ratio actual/base sobre los tiempos relativos a la calibración (si la línea base los tiene)."""
+    if base.get("relativo"):
+        return actual["relativo"] / base["relativo"]
+    return actual["seg"] / base["seg"]
+
+# ---------------------- CASOS ----------------------
+def casos_landmarks():
+    X_test, _ = load_clean_splits(("test",))
+    fila = X_test[0].copy()
+    casos = {
+        "csv_parse": lambda: read_landmark_csv(SAMPLE_CSV),
+        "normalizacion_fila": lambda: center_and_scale_vec(fila),
+        "normalizacion_lote": lambda: center_and_scale_batch(X_test),
+        "zscore_limpieza": lambda: remove_outliers_zscore(X_test),
+    }
+
+    from clasificador_knn import construir_desde_dataset
+    knn = construir_desde_dataset(splits=("val",))
+    casos["knn_fila"] = lambda: knn.predecir_proba(fila[None, :])
+    casos["knn_lote"] = lambda: knn.predecir_proba(X_test[:256])
+    return casos, X_test
+
+def casos_keras(X_test):
+    try:
+        import tensorflow as tf
+    except ImportError:
+        print("AVISO: TensorFlow no disponible, se saltan keras_fila / keras_lote.")
+        return {}
+    modelo = tf.keras.models.load_model(MODEL_PATH)
+    fila = X_test[:1]
+    lote = X_test[:256]
+    return {
+        "keras_fila": lambda: modelo(fila, training=False),
+        "keras_lote": lambda: modelo(lote, training=False),
+    }
+
+def casos_captura(tmp_dir):
+    try:
+        import cv2
+        import captura_video_descargado_landmark as cvd
+    except ImportError as e:
+        print(f"AVISO: no se pudo importar el pipeline de video ({e}), se saltan preprocess_frame / csv_append_fila.")
+        return {}
+
+    cap = cv2.VideoCapture(SAMPLE_CLIP)
+    frames = []
+    while len(frames) < N_FRAMES_MUESTRA:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+
+    casos = {}
+    if frames:
+        estado = {"i": 0}
+
+        def preprocess():
+            cvd.preprocess_frame(frames[estado["i"] % len(frames)])
+            estado["i"] += 1
+        casos["preprocess_frame"] = preprocess
+    else:
+        print(f"AVISO: no se pudieron leer frames de {SAMPLE_CLIP}, se salta preprocess_frame.")
+
+    tmp_csv = os.path.join(tmp_dir, "A.csv")
+    lm_list = [0.5] * 63
+    casos["csv_append_fila"] = lambda: cvd.append_landmark_row(tmp_csv, "2025-01-01T00:00:00Z|0.000s", "video", lm_list)
+    return casos
+
+# ---------------------- LÍNEA BASE ----------------------
+def info_maquina():
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "processor": platform.processor(), "node": platform.node()}
+
+def cargar_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        datos = json.load(f)
+    # formato anterior: solo segundos por caso, sin calibración
+    datos["casos"] = {n: (v if isinstance(v, dict) else {"seg": v}) for n, v in datos["casos"].items()}
+    return datos
+
+def guardar_baseline(path, resultados, previa=None):
+    datos = previa or {"casos": {}}
+    datos["maquina"] = info_maquina()
+    datos["casos"].update(resultados)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(datos, f, indent=2, sort_keys=True)
+
+# ---------------------- RUN ----------------------
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks con línea base y umbral de regresión.")
+    parser.add_argument("--guardar", action="store_true", help="guardar los resultados como línea base")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+    parser.add_argument("--corridas", type=int, default=CORRIDAS_BASELINE,
+                        help="mediciones por caso con --guardar (se guarda la mediana)")
+    parser.add_argument("--solo", default="", help="lista de casos separada por comas")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_") as tmp_dir:
+        return ejecutar(args, parser, tmp_dir)
+
+def ejecutar(args, parser, tmp_dir):
+    casos, X_test = casos_landmarks()
+    casos.update(casos_keras(X_test))
+    casos.update(casos_captura(tmp_dir))
+    if args.solo:
+        pedidos = [c.strip() for c in args.solo.split(",") if c.strip()]
+        desconocidos = [c for c in pedidos if c not in casos]
+        if desconocidos:
+            parser.error(f"casos desconocidos o no disponibles: {desconocidos}")
+        casos = {c: casos[c] for c in pedidos}
+
+    baseline = cargar_baseline(args.baseline)
+    base_casos = baseline["casos"] if baseline else {}
+    if baseline and baseline.get("maquina", {}).get("node") != platform.node():
+        print("AVISO: la línea base se midió en otra máquina; la comparación puede no ser válida.")
+
+    corridas = max(args.corridas, 1) if args.guardar else 1
+    mediciones = {nombre: [] for nombre in casos}
+    for _ in range(corridas):
+        for nombre, fn in casos.items():
+            mediciones[nombre].append(medir(fn))
+
+    resultados = {}
+    regresiones = []
+    print(f"{'caso':<22}{'actual':>14}{'base':>14}{'ratio':>9}")
+    for nombre, fn in casos.items():
+        actual = {k: float(np.median([m[k] for m in mediciones[nombre]])) for k in mediciones[nombre][0]}
+        resultados[nombre] = actual
+        seg = actual["seg"]
+        base = base_casos.get(nombre)
+        if base:
+            r = ratio(actual, base)
+            for _ in range(0 if args.guardar else REINTENTOS):
+                if r <= 1.0 + args.tolerancia:
+                    break
+                r = min(r, ratio(medir(fn), base))
+            marca = "  REGRESIÓN" if r > 1.0 + args.tolerancia else ""
+            if marca:
+                regresiones.append(nombre)
+            print(f"{nombre:<22}{seg * 1e6:>11.1f} µs{base['seg'] * 1e6:>11.1f} µs{r:>8.2f}x{marca}")
+        else:
+            print(f"{nombre:<22}{seg * 1e6:>11.1f} µs{'-':>14}{'-':>9}")
+
+    if args.guardar:
+        guardar_baseline(args.baseline, resultados, baseline)
+        print(f"\nLínea base guardada en {args.baseline} (mediana de {corridas} corridas)")
+        return 0
+    if not baseline:
+        print(f"\nNo hay línea base en {args.baseline}. Ejecuta con --guardar para crearla.")
+        return 2
+    sin_base = [n for n in resultados if n not in base_casos]
+    if sin_base:
+        print(f"\nAVISO: casos sin línea base (no se comparan): {', '.join(sin_base)}")
+    if regresiones:
+        print(f"\n{len(regresiones)} regresión(es) por encima de {args.tolerancia:.0%}: {', '.join(regresiones)}")
+        return 1
+    print(f"\nSin regresiones (tolerancia {args.tolerancia:.0%}).")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+buffers_frame.py
+Camino de procesamiento de frames sin asignaciones por frame, compartido por los scripts
+de captura y el detector en tiempo real:
+- La cámara escribe siempre en el mismo buffer (cap.read(image=...)).
+- El espejo (flip) y la conversión BGR->RGB escriben en buffers preasignados usando
+  el argumento `dst` de OpenCV.
+- Se dibuja sobre el frame BGR y MediaPipe recibe el RGB: no hay conversión de ida y vuelta.
+
+Lleva la cuenta de asignaciones y bytes copiados por frame para vigilar el churn de memoria.
+"""
+
+import cv2
+import numpy as np
+
+
+class ProcesadorFrame:
+    """Uso típico:
+        procesador = ProcesadorFrame(espejo=True)
+        ret, frame = procesador.leer(cap)
+        frame_bgr, frame_rgb = procesador.procesar(frame)   # dibujar en frame_bgr, MediaPipe con frame_rgb
+    Los arrays devueltos se reutilizan en el siguiente frame: si hay que conservarlos, copiarlos.
+    """
+
+    def __init__(self, espejo=False):
+        self.espejo = espejo
+        self._captura = None
+        self._bgr = None
+        self._rgb = None
+        self.frames = 0
+        self.asignaciones = 0
+        self.bytes_asignados = 0
+        self.bytes_copiados = 0
+
+    def _buffer(self, actual, shape):
+        """Devuelve `actual` si sirve para `shape`; si no, reserva uno nuevo (y lo cuenta)."""
+        if actual is not None and actual.shape == shape:
+            return actual
+        nuevo = np.empty(shape, dtype=np.uint8)
+        self.asignaciones += 1
+        self.bytes_asignados += nuevo.nbytes
+        return nuevo
+
+    def leer(self, cap):
+        """cap.read() reutilizando el buffer de captura. Igual que cap.read(): devuelve (ret, frame)."""
+        ret, frame = cap.read(self._captura)
+        if ret and frame is not self._captura:
+            # primer frame o cambio de resolución: OpenCV tuvo que reservar uno nuevo
+            self._captura = frame
+            self.asignaciones += 1
+            self.bytes_asignados += frame.nbytes
+        return ret, frame
+
+    def procesar(self, frame):
+        """Devuelve (frame_bgr para dibujar/mostrar, frame_rgb para MediaPipe)."""
+        if self.espejo:
+            self._bgr = self._buffer(self._bgr, frame.shape)
+            cv2.flip(frame, 1, dst=self._bgr)
+            self.bytes_copiados += frame.nbytes
+            frame_bgr = self._bgr
+        else:
+            frame_bgr = frame
+        self._rgb = self._buffer(self._rgb, frame.shape)
+        cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        self.bytes_copiados += frame.nbytes
+        self.frames += 1
+        return frame_bgr, self._rgb
+
+    def resumen(self):
+        n = max(self.frames, 1)
+        return (f"frames={self.frames} | asignaciones={self.asignaciones} "
+                f"({self.asignaciones / n:.3f}/frame, {self.bytes_asignados / 1e6:.1f} MB en total) "
+                f"| copiado={self.bytes_copiados / n / 1e6:.2f} MB/frame")
@@ -0,0 +1,181 @@
+"""
+cache_frames.py
+Caché en disco de frames ya decodificados y preprocesados para captura_video_descargado_landmark.py.
+
+Cada clip se decodifica y preprocesa (denoise + ecualización + resize a TARGET_SIZE) una sola vez:
+ - <cache>/<LETRA>/<clip>.u8         frames uint8 (N, alto, ancho, 3) BGR, crudos, leídos con np.memmap
+                                     (leer un frame no cuesta ninguna decodificación)
+ - <cache>/<LETRA>/<clip>.json       índice: forma, fps, índice y timestamp (ms) de cada frame guardado
+                                     y clave de validez
+
+Solo se preprocesan y guardan los frames del FRAME_STEP pedido (el resto se salta con grab()),
+así que la primera corrida no hace más denoise que sin caché. La caché sirve para cualquier
+FRAME_STEP múltiplo del que se usó al construirla; con otro paso se reconstruye.
+Cambiar min_detection_confidence o los parámetros de Hands no la invalida. Se invalida si cambia
+el clip de origen (tamaño o fecha de modificación) o la configuración de preprocesamiento.
+
+Con comprimir=True (opcional) los frames se guardan como PNG sin pérdida en <clip>.bin: ocupan
+~10 veces menos pero cada lectura paga un cv2.imdecode.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+import cv2
+import numpy as np
+
+# -------------------------
+# Config
+# -------------------------
+CACHE_DIR = "cache_frames"
+FORMATO = 3      # subir si cambia el formato de los archivos de caché
+COMPRIMIR = False
+PNG_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]   # nivel bajo: casi el mismo tamaño y bastante más rápido
+
+
+def clave_config(config):
+    """Hash estable de la configuración de preprocesamiento (dict serializable a JSON)."""
+    texto = json.dumps(config, sort_keys=True)
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+def firma_fuente(video_path):
+    st = os.stat(video_path)
+    return {"tamano": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+def rutas_cache(video_path, cache_dir=CACHE_DIR, comprimir=COMPRIMIR):
+    video_path = Path(video_path)
+    base = Path(cache_dir) / video_path.parent.name / video_path.stem
+    return base.with_suffix(".bin" if comprimir else ".u8"), base.with_suffix(".json")
+
+
+class ClipCacheado:
+    """Frames guardados de un clip. frame(j) devuelve el j-ésimo frame guardado, que corresponde
+       al frame frame_idx[j] del video original.
+    """
+
+    def __init__(self, frames_path, indice):
+        self.indice = indice
+        self.fps = indice["fps"]
+        self.frame_step = indice["frame_step"]
+        self.total_frames = indice["total_frames"]
+        self.frame_idx = np.asarray(indice["frame_idx"], dtype=np.int64)
+        self.pos_ms = np.asarray(indice["pos_ms"], dtype=np.float64)
+        self.comprimido = indice["comprimido"]
+        n = len(self.frame_idx)
+        if self.comprimido:
+            self.offsets = np.asarray(indice["offsets"], dtype=np.int64)   # n + 1
+            tam = int(self.offsets[-1])
+            self.frames = np.memmap(frames_path, dtype=np.uint8, mode="r", shape=(tam,)) if tam else None
+        elif n:
+            self.frames = np.memmap(frames_path, dtype=np.uint8, mode="r", shape=(n, *indice["shape"]))
+        else:
+            self.frames = np.empty((0, *indice["shape"]), dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.frame_idx)
+
+    def frame(self, j):
+        if self.comprimido:
+            return cv2.imdecode(self.frames[self.offsets[j]:self.offsets[j + 1]], cv2.IMREAD_COLOR)
+        return self.frames[j]
+
+
+def _indice_valido(indice_path, video_path, config, frame_step):
+    if not indice_path.exists():
+        return None
+    try:
+        with open(indice_path, "r", encoding="utf-8") as f:
+            indice = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (indice.get("formato") != FORMATO
+            or indice.get("fuente") != firma_fuente(video_path)
+            or indice.get("config") != clave_config(config)
+            or frame_step % indice.get("frame_step", 0) != 0):
+        return None
+    return indice
+
+def construir(video_path, preprocess_fn, config, cache_dir=CACHE_DIR, frame_step=1, comprimir=COMPRIMIR):
+    """Decodifica y preprocesa los frames frame_idx % frame_step == 0 y los escribe en la caché.
+       Devuelve el índice. Lanza IOError si el clip no se puede abrir.
+    """
+    frames_path, indice_path = rutas_cache(video_path, cache_dir, comprimir)
+    frames_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = frames_path.with_suffix(frames_path.suffix + ".tmp")
+
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        raise IOError(f"no se pudo abrir: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frame_idx, guardados, pos_ms, offsets = 0, [], [], [0]
+    shape = None
+    try:
+        with open(tmp_path, "wb") as f:
+            while True:
+                if frame_idx % frame_step != 0:
+                    # grab() avanza sin decodificar ni preprocesar el frame
+                    if not cap.grab():
+                        break
+                    frame_idx += 1
+                    continue
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                proc = np.ascontiguousarray(preprocess_fn(frame), dtype=np.uint8)
+                if shape is None:
+                    shape = proc.shape
+                elif proc.shape != shape:
+                    raise ValueError(f"tamaño de frame inconsistente en {video_path}: {proc.shape} vs {shape}")
+                if comprimir:
+                    ok, buf = cv2.imencode(".png", proc, PNG_PARAMS)
+                    if not ok:
+                        raise IOError(f"no se pudo codificar el frame {frame_idx} de {video_path}")
+                    f.write(buf.data)
+                    offsets.append(offsets[-1] + len(buf))
+                else:
+                    f.write(proc.data)
+                guardados.append(frame_idx)
+                pos_ms.append(cap.get(cv2.CAP_PROP_POS_MSEC))
+                frame_idx += 1
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    finally:
+        cap.release()
+
+    indice = {
+        "formato": FORMATO,
+        "fuente": firma_fuente(video_path),
+        "config": clave_config(config),
+        "config_legible": config,
+        "fps": fps,
+        "frame_step": frame_step,
+        "total_frames": frame_idx,
+        "shape": list(shape) if shape else [0, 0, 3],
+        "comprimido": comprimir,
+        "frame_idx": guardados,
+        "pos_ms": pos_ms,
+    }
+    if comprimir:
+        indice["offsets"] = offsets
+    # primero los frames y al final el índice: si se corta a medias, la caché queda inválida
+    indice_path.unlink(missing_ok=True)
+    os.replace(tmp_path, frames_path)
+    rutas_cache(video_path, cache_dir, not comprimir)[0].unlink(missing_ok=True)   # variante vieja
+    with open(indice_path, "w", encoding="utf-8") as f:
+        json.dump(indice, f)
+    return indice
+
+def obtener(video_path, preprocess_fn, config, cache_dir=CACHE_DIR, frame_step=1, comprimir=COMPRIMIR):
+    """Devuelve un ClipCacheado que cubre frame_step, construyéndolo si no existe o quedó obsoleto."""
+    _, indice_path = rutas_cache(video_path, cache_dir)
+    indice = _indice_valido(indice_path, video_path, config, frame_step)
+    if indice is not None:
+        frames_path, _ = rutas_cache(video_path, cache_dir, indice["comprimido"])
+        if frames_path.exists():
+            return ClipCacheado(frames_path, indice)
+    frames_path, _ = rutas_cache(video_path, cache_dir, comprimir)
+    print(f"[cache] construyendo {frames_path} (frame_step={frame_step})")
+    indice = construir(video_path, preprocess_fn, config, cache_dir, frame_step, comprimir)
+    return ClipCacheado(frames_path, indice)
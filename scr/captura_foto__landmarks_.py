@@ -13,6 +13,8 @@ import time
 import os
 import csv
 
+from buffers_frame import ProcesadorFrame
+
 # -------------------------
 # Config
 # -------------------------
@@ -85,6 +87,9 @@ if not cap.isOpened():
     print("Error: no se pudo abrir la cámara.")
     exit(1)
 
+# buffers reutilizados entre frames (captura + RGB para MediaPipe)
+procesador = ProcesadorFrame(espejo=False)
+
 # -------------------------
 # Variables de control del temporizador
 # -------------------------
@@ -124,13 +129,13 @@ def save_landmarks_to_csv(landmarks, capture_type="manual", frame_bgr=None):
 # -------------------------
 try:
     while True:
-        ret, frame = cap.read()
+        ret, frame = procesador.leer(cap)
         if not ret:
             print("Error: frame no recibido.")
             break
 
         # Para visualizar texto correctamente, trabajamos con BGR en frame
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        frame, rgb_frame = procesador.procesar(frame)
         results = hands.process(rgb_frame)
 
         hand_count = 0
@@ -192,5 +197,6 @@ finally:
     hands.close()
     print(f"Sesión finalizada. Ejemplos totales para '{gesture_name}': {existing_count + session_saves}")
     print(f"CSV guardado en: {csv_path}")
+    print("Memoria por frame:", procesador.resumen())
     if SAVE_IMGS_ON_MANUAL:
         print(f"Imágenes guardadas en: {img_dir}")
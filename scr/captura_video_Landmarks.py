@@ -4,6 +4,9 @@ record_landmarks.py
 Graba hasta 2 minutos desde la webcam, extrae los 21 landmarks por mano usando MediaPipe
 y guarda un CSV por mano por fotograma en la carpeta 'dataset_landmarks'.
 
+Con BACKGROUND_WRITERS el video (mp4v) y los CSV se escriben en procesos de fondo con colas
+acotadas, para que la codificación y el disco no frenen el bucle de captura.
+
 Controles en la ventana:
  - Presiona 's' para empezar a grabar.
  - Presiona 'q' para detener antes de los 2 minutos.
@@ -16,11 +19,15 @@ import csv
 import time
 from datetime import datetime
 
+from buffers_frame import ProcesadorFrame
+from escritura_segundo_plano import EscritorVideo, EscritorFuncion
+
 # ---------- Config ----------
 OUTPUT_DIR = "dataset_landmarks"
 MAX_SECONDS = 120  # 2 minutos
 VIDEO_SAVE = True   # guarda también un video .mp4 de la sesión
 VIDEO_CODEC = "mp4v"  # codec para VideoWriter
+BACKGROUND_WRITERS = True  # codificar video y escribir CSV en procesos de fondo
 # ----------------------------
 
 def ensure_dir(path):
@@ -73,6 +80,8 @@ def main():
     frame_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT) or 480)
 
     video_writer = None
+    escritor_video = None
+    escritor_csv = None
     start_time = None
     recording = False
     frame_idx = 0
@@ -81,8 +90,14 @@ def main():
 
     if VIDEO_SAVE:
         out_video_path = os.path.join(OUTPUT_DIR, f"{letra}_{start_timestamp_str}.mp4")
-        fourcc = cv2.VideoWriter_fourcc(*VIDEO_CODEC)
-        video_writer = cv2.VideoWriter(out_video_path, fourcc, cap_fps, (frame_width, frame_height))
+        if BACKGROUND_WRITERS:
+            escritor_video = EscritorVideo(out_video_path, VIDEO_CODEC, cap_fps, (frame_width, frame_height))
+        else:
+            fourcc = cv2.VideoWriter_fourcc(*VIDEO_CODEC)
+            video_writer = cv2.VideoWriter(out_video_path, fourcc, cap_fps, (frame_width, frame_height))
+
+    if BACKGROUND_WRITERS:
+        escritor_csv = EscritorFuncion(save_landmarks_csv)
 
     # MediaPipe hands init
     mp_hands = mp.solutions.hands
@@ -94,18 +109,24 @@ def main():
         min_tracking_confidence=0.5
     )
 
+    # buffers reutilizados entre frames (espejo + RGB para MediaPipe)
+    procesador = ProcesadorFrame(espejo=True)
+
+    # FPS del bucle (media móvil) para comprobar que grabar no lo baja
+    fps_loop = 0.0
+    prev_t = time.perf_counter()
+
     print("Cámara abierta. Presiona 's' para empezar la grabación (máx 120s). Presiona 'q' para salir.")
 
     try:
         while True:
-            ret, frame = cap.read()
+            ret, frame = procesador.leer(cap)
             if not ret:
                 print("Error leyendo cámara.")
                 break
 
-            # Flip para modo espejo (opcional)
-            frame_rgb = cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
-            image_for_draw = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
+            # Flip para modo espejo: se dibuja sobre el BGR y MediaPipe recibe el RGB (sin ida y vuelta)
+            image_for_draw, frame_rgb = procesador.procesar(frame)
 
             # Si estamos grabando, procesar y guardar landmarks
             if recording:
@@ -140,24 +161,41 @@ def main():
                         ts = time.time()
                         fname = f"{letra}_{start_timestamp_str}_frame{frame_idx:06d}_{hand_label.upper()}.csv"
                         fpath = os.path.join(OUTPUT_DIR, fname)
-                        save_landmarks_csv(fpath, frame_idx, ts, hand_label.upper(), coords)
-                        saved_files += 1
+                        if escritor_csv is not None:
+                            if escritor_csv.enviar((fpath, frame_idx, ts, hand_label.upper(), coords)):
+                                saved_files += 1
+                        else:
+                            save_landmarks_csv(fpath, frame_idx, ts, hand_label.upper(), coords)
+                            saved_files += 1
 
                 # escribir video
-                if video_writer is not None:
-                    # recordar que flip invertimos antes, así mantenemos espejo en el video también
+                # recordar que flip invertimos antes, así mantenemos espejo en el video también
+                if escritor_video is not None:
+                    # copia: image_for_draw es un buffer que se reutiliza en el siguiente frame
+                    escritor_video.enviar(image_for_draw.copy())
+                elif video_writer is not None:
                     video_writer.write(image_for_draw)
 
                 # mostrar tiempo restante en la imagen
                 remaining = max(0, MAX_SECONDS - int(elapsed))
                 cv2.putText(image_for_draw, f"Grabando ({remaining}s restantes) - Frame: {frame_idx}",
                             (10,30), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0,255,255), 2)
+                if escritor_video is not None:
+                    cv2.putText(image_for_draw,
+                                f"Cola video: {escritor_video.profundidad()}  descartados: {escritor_video.descartados}",
+                                (10,90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0,255,255), 1)
 
                 frame_idx += 1
             else:
                 cv2.putText(image_for_draw, "Presiona 's' para iniciar grabacion, 'q' para salir",
                             (10,30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (200,200,200), 2)
 
+            now_t = time.perf_counter()
+            fps_loop = 0.9 * fps_loop + 0.1 / max(now_t - prev_t, 1e-6)
+            prev_t = now_t
+            cv2.putText(image_for_draw, f"FPS: {fps_loop:.0f}", (10,60),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0,255,0), 1)
+
             cv2.imshow("Record Landmarks - Presiona s para empezar", image_for_draw)
 
             key = cv2.waitKey(1) & 0xFF
@@ -176,9 +214,14 @@ def main():
         cap.release()
         if video_writer:
             video_writer.release()
+        for escritor in (escritor_video, escritor_csv):
+            if escritor is not None:
+                escritor.cerrar()
+                print(escritor.resumen())
         hands.close()
         cv2.destroyAllWindows()
         print(f"Sesión finalizada. Archivos CSV guardados en '{OUTPUT_DIR}': {saved_files}")
+        print("Memoria por frame:", procesador.resumen())
 
 if __name__ == "__main__":
     main()
@@ -17,6 +17,10 @@ Parámetros editables (al inicio del archivo):
  - FRAME_STEP: procesar cada N-ésimo frame (1 = todos)
  - TARGET_SIZE: (w,h) para redimensionar
  - SAVE_IMAGES: guardar frames procesados (opcional)
+ - USE_FRAME_CACHE: decodificar/preprocesar cada clip una sola vez y reutilizar los frames
+   desde una caché en memoria mapeada (cache_frames.py) en las siguientes corridas.
+   Desactivada por defecto: guarda ~900 KB por frame a 640x480 (solo los de FRAME_STEP)
+ - FRAME_CACHE_DIR: fuera de la carpeta sincronizada de OneDrive (la caché es regenerable)
 """
 
 import os
@@ -25,8 +29,8 @@ from pathlib import Path
 from datetime import datetime
 import cv2
 import numpy as np
-import mediapipe as mp
-from tqdm import tqdm
+
+import cache_frames
 
 # ---------------------- CONFIGURACIÓN ----------------------
 VIDEOS_DIR   = r"C:\Users\julia\OneDrive PolitecnicoGrancolombiano\Documentos\U\SEMESTRE 6\SISTEMAS OPERACIONALES\PROG\proyecto\Reconocimiento_Senias\videos_proc"
@@ -37,12 +41,13 @@ DENoISE      = True                    # aplicar denoise
 SAVE_IMAGES  = False                   # guardar frames procesados
 IMAGES_DIR   = r"C:\Users\julia\OneDrive PolitecnicoGrancolombiano\Documentos\U\SEMESTRE 6\SISTEMAS OPERACIONALES\PROG\proyecto\Reconocimiento_Senias\debug_frames"
 CAPTURE_TYPE = "video"                 # valor en columna capture_type
+USE_FRAME_CACHE = False                # activar para reutilizar frames preprocesados entre corridas
+FRAME_CACHE_COMPRESS = False           # PNG sin pérdida: ~10x menos disco, pero cada lectura decodifica
+FRAME_CACHE_DIR = os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~/.cache")),
+                               "Reconocimiento_Senias", "cache_frames")   # local, no sincronizada
+PREPROCESS_VERSION = 1                 # subir si cambia preprocess_frame (invalida la caché)
 # -----------------------------------------------------------
 
-# MediaPipe config
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
-
 # header expected in CSVs
 LM_HEADER = ["time", "capture_type"] + [f"{c}{i}" for i in range(21) for c in ("x","y","z")]
 
@@ -76,6 +81,49 @@ def preprocess_frame(frame_bgr):
     f = resize_frame(f, TARGET_SIZE)
     return f
 
+def preprocess_config():
+    """Todo lo que afecta a preprocess_frame; si cambia, la caché de frames se reconstruye."""
+    return {"version": PREPROCESS_VERSION, "target_size": list(TARGET_SIZE), "denoise": DENoISE}
+
+def iterar_frames_preprocesados(video_path, frame_step=1):
+    """Genera (frame_idx, total_frames, pos_ms, frame_preprocesado) para los frames frame_idx % frame_step == 0.
+       Con USE_FRAME_CACHE los frames salen de la caché sin decodificar el video ni preprocesar de nuevo.
+       Un clip que no se puede abrir se reporta y se salta (no corta la corrida).
+    """
+    if USE_FRAME_CACHE:
+        try:
+            clip = cache_frames.obtener(video_path, preprocess_frame, preprocess_config(), FRAME_CACHE_DIR,
+                                        frame_step=frame_step, comprimir=FRAME_CACHE_COMPRESS)
+        except (OSError, ValueError) as e:
+            print("ERROR: no se pudo abrir:", video_path, f"({e})")
+            return
+        for j, frame_idx in enumerate(clip.frame_idx):
+            if frame_idx % frame_step == 0:
+                yield int(frame_idx), clip.total_frames, clip.pos_ms[j], clip.frame(j)
+        return
+
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        print("ERROR: no se pudo abrir:", video_path)
+        return
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+    frame_idx = 0
+    try:
+        while True:
+            if frame_idx % frame_step != 0:
+                # grab() avanza sin decodificar el frame completo
+                if not cap.grab():
+                    break
+                frame_idx += 1
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                break
+            yield frame_idx, total_frames, cap.get(cv2.CAP_PROP_POS_MSEC), preprocess_frame(frame)
+            frame_idx += 1
+    finally:
+        cap.release()
+
 # ---------------------- CSV APPEND ----------------------
 def ensure_csv_with_header(csv_path):
     if not os.path.exists(csv_path):
@@ -93,34 +141,23 @@ def append_landmark_row(csv_path, time_str, capture_type, landmark_list):
 
 # ---------------------- MAIN PROCESS ----------------------
 def process_video_file(video_path, out_csv_path, save_images=False, debug_folder=None, frame_step=1):
-    cap = cv2.VideoCapture(str(video_path))
-    if not cap.isOpened():
-        print("ERROR: no se pudo abrir:", video_path)
-        return 0
-
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
-    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    # MediaPipe y tqdm solo hacen falta aquí: el preprocesamiento y el CSV se pueden importar
+    # sin ellos (p. ej. desde benchmark_primitivas.py)
+    import mediapipe as mp
+    from tqdm import tqdm
 
+    mp_hands = mp.solutions.hands
     hands = mp_hands.Hands(static_image_mode=False,
                            max_num_hands=1,
                            min_detection_confidence=0.5,
                            min_tracking_confidence=0.5)
 
-    saved = 0
-    pbar = tqdm(total=total_frames//frame_step + 1, desc=Path(video_path).name, unit="step")
-    frame_idx = 0
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        if frame_idx % frame_step != 0:
-            frame_idx += 1
-            pbar.update(1)
-            continue
+    pbar = None
+    procesados = 0
 
-        proc = preprocess_frame(frame)
+    for frame_idx, total_frames, pos_ms, proc in iterar_frames_preprocesados(video_path, frame_step):
+        if pbar is None:
+            pbar = tqdm(total=total_frames//frame_step + 1, desc=Path(video_path).name, unit="step")
         image_rgb = cv2.cvtColor(proc, cv2.COLOR_BGR2RGB)
         results = hands.process(image_rgb)
 
@@ -130,7 +167,6 @@ def process_video_file(video_path, out_csv_path, save_images=False, debug_folder
             for l in lm.landmark:
                 lm_list.extend([l.x, l.y, l.z])
 
-            pos_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
             now_iso = datetime.utcnow().isoformat(timespec="seconds") + "Z"
             time_str = f"{now_iso}|{pos_ms/1000:.3f}s"
 
@@ -140,13 +176,13 @@ def process_video_file(video_path, out_csv_path, save_images=False, debug_folder
                 out_img = os.path.join(debug_folder, f"{Path(video_path).stem}_f{frame_idx:06d}.jpg")
                 cv2.imwrite(out_img, proc)
 
-        frame_idx += 1
+        procesados = frame_idx + 1
         pbar.update(1)
 
-    pbar.close()
+    if pbar is not None:
+        pbar.close()
     hands.close()
-    cap.release()
-    return frame_idx
+    return procesados
 
 def process_all(videos_dir=VIDEOS_DIR, dataset_dir=DATASET_DIR, frame_step=FRAME_STEP, save_images=SAVE_IMAGES):
     videos_dir = Path(videos_dir)
@@ -184,4 +220,5 @@ if __name__ == "__main__":
     print("INFO: videos_dir:", VIDEOS_DIR)
     print("INFO: dataset_dir:", DATASET_DIR)
     print("INFO: frame_step:", FRAME_STEP, "target_size:", TARGET_SIZE, "denoise:", DENoISE)
+    print("INFO: frame_cache:", FRAME_CACHE_DIR if USE_FRAME_CACHE else "desactivada")
     process_all()
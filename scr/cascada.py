@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+cascada.py
+Cascada de clasificadores con compuerta de confianza:
+ - Etapa rápida: regresión logística lineal (NumPy) sobre los landmarks normalizados más
+   las distancias entre pares de landmarks (63 + 210 características), o bien kNN / prototipos
+   de clase (clasificador_knn.py). Responde sola cuando su probabilidad máxima >= umbral.
+ - Etapa lenta: modelo_signos.h5 (Keras), solo para los frames ambiguos.
+
+Uso:
+     python scr/cascada.py --entrenar             # entrena la etapa lineal y la guarda (necesario una vez)
+     python scr/cascada.py --evaluar              # evalúa en X_test.npy
+     python scr/cascada.py --evaluar --clips      # además reproduce los clips de videos_proc
+
+Reporta la fracción de frames resuelta por cada etapa, la latencia de cada etapa y la precisión
+de extremo a extremo.
+"""
+
+import os
+import time
+import argparse
+import numpy as np
+
+from procesamiento_landmarks import center_and_scale_batch, load_clean_splits, load_label2id, N_FEATURES
+
+# -------------------------
+# Config
+# -------------------------
+MODEL_PATH = "modelo/modelo_signos.h5"
+LINEAR_PATH = "modelo/etapa_lineal.npz"
+ETAPA_RAPIDA = "lineal" # "lineal", "prototipos" o "knn" (kNN recorre todo el índice: no es barato)
+UMBRAL = 0.90           # confianza mínima para que la etapa rápida responda sola
+EPOCAS = 500
+LR = 0.5
+L2 = 1e-4
+
+
+_PARES = np.triu_indices(21, 1)
+N_CARACTERISTICAS = N_FEATURES + len(_PARES[0])
+
+
+def caracteristicas_lineales(X_norm):
+    """(N,63) -> (N,273): coordenadas + distancias entre los 210 pares de landmarks.
+       Las distancias separan formas de mano que un modelo lineal sobre coordenadas no distingue.
+    """
+    pts = np.atleast_2d(X_norm).astype(np.float32).reshape(-1, 21, 3)
+    dist = np.linalg.norm(pts[:, _PARES[0]] - pts[:, _PARES[1]], axis=2)
+    return np.hstack([pts.reshape(-1, N_FEATURES), dist])
+
+
+class ClasificadorLineal:
+    """Regresión logística multiclase entrenada con descenso de gradiente completo en NumPy.
+       Predecir cuesta las distancias de 210 pares y una multiplicación (N,273)x(273,C),
+       sin pasar por TensorFlow.
+    """
+
+    def __init__(self, W=None, b=None):
+        self.W = W
+        self.b = b
+
+    def ajustar(self, X, y, num_clases, epocas=EPOCAS, lr=LR, l2=L2):
+        X = caracteristicas_lineales(X)
+        Y = np.eye(num_clases, dtype=np.float32)[y]
+        self.W = np.zeros((N_CARACTERISTICAS, num_clases), dtype=np.float32)
+        self.b = np.zeros(num_clases, dtype=np.float32)
+        n = len(X)
+        for _ in range(epocas):
+            grad = self._softmax(X @ self.W + self.b) - Y
+            self.W -= lr * (X.T @ grad / n + l2 * self.W)
+            self.b -= lr * grad.mean(axis=0)
+        return self
+
+    def predecir_proba(self, X_norm):
+        return self._softmax(caracteristicas_lineales(X_norm) @ self.W + self.b)
+
+    @staticmethod
+    def _softmax(logits):
+        logits = logits - logits.max(axis=1, keepdims=True)
+        p = np.exp(logits)
+        p /= p.sum(axis=1, keepdims=True)
+        return p
+
+    def guardar(self, path=LINEAR_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez(path, W=self.W, b=self.b)
+
+    @classmethod
+    def cargar(cls, path=LINEAR_PATH):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"No existe {path}: ejecuta 'python scr/cascada.py --entrenar' primero.")
+        data = np.load(path)
+        if data["W"].shape[0] != N_CARACTERISTICAS:
+            raise ValueError(f"{path} se entrenó con otras características: vuelve a ejecutar --entrenar.")
+        return cls(data["W"], data["b"])
+
+
+class CascadaClasificadores:
+    """Combina una etapa rápida y una lenta. Ambas reciben vectores normalizados (N,63)
+       y devuelven probabilidades (N,C). La etapa lenta solo recibe, en una única llamada
+       por lote, las filas donde la rápida no superó el umbral.
+    """
+
+    def __init__(self, proba_rapida, proba_lenta, umbral=UMBRAL):
+        self.proba_rapida = proba_rapida
+        self.proba_lenta = proba_lenta
+        self.umbral = umbral
+        self.reiniciar_estadisticas()
+
+    def reiniciar_estadisticas(self):
+        self.n_total = 0
+        self.n_rapida = 0
+        self.n_lenta = 0
+        self.llamadas = 0
+        self.llamadas_lenta = 0
+        self.t_rapida = 0.0
+        self.t_lenta = 0.0
+
+    def predecir_proba(self, X_norm, etapas=None):
+        """Si se pasa `etapas` (array int de largo N) se marca 0 = rápida, 1 = lenta por fila."""
+        X_norm = np.atleast_2d(X_norm)
+        t0 = time.perf_counter()
+        probs = self.proba_rapida(X_norm)
+        ambiguas = np.flatnonzero(probs.max(axis=1) < self.umbral)
+        t1 = time.perf_counter()
+        self.t_rapida += t1 - t0
+        self.llamadas += 1
+        if len(ambiguas):
+            probs = probs.copy()
+            lentas = self.proba_lenta(X_norm[ambiguas])
+            self.t_lenta += time.perf_counter() - t1
+            self.llamadas_lenta += 1
+            # la etapa rápida puede tener clases enroladas que el modelo Keras no conoce
+            probs[ambiguas] = 0.0
+            probs[ambiguas, :lentas.shape[1]] = lentas
+        if etapas is not None:
+            etapas[:] = 0
+            etapas[ambiguas] = 1
+        self.n_total += len(X_norm)
+        self.n_lenta += len(ambiguas)
+        self.n_rapida += len(X_norm) - len(ambiguas)
+        return probs
+
+    def resumen(self):
+        total = max(self.n_total, 1)
+        ms_rapida = self.t_rapida / max(self.llamadas, 1) * 1000
+        ms_lenta = self.t_lenta / max(self.llamadas_lenta, 1) * 1000
+        return (f"frames={self.n_total} | etapa rápida={self.n_rapida / total:.1%} ({ms_rapida:.3f} ms/llamada) "
+                f"| etapa lenta={self.n_lenta / total:.1%} ({ms_lenta:.3f} ms/llamada) (umbral={self.umbral})")
+
+
+def cargar_etapa_rapida(tipo=ETAPA_RAPIDA):
+    """Devuelve la función proba de la etapa rápida: 'lineal', 'prototipos' o 'knn'."""
+    if tipo == "lineal":
+        return ClasificadorLineal.cargar(LINEAR_PATH).predecir_proba
+    from clasificador_knn import ClasificadorVecinos, construir_desde_dataset, INDEX_PATH
+    if os.path.exists(INDEX_PATH):
+        return ClasificadorVecinos.cargar(INDEX_PATH, modo=tipo).predecir_proba
+    return construir_desde_dataset(modo=tipo).predecir_proba
+
+def cargar_etapa_lenta(model_path=MODEL_PATH):
+    import tensorflow as tf
+    modelo = tf.keras.models.load_model(model_path)
+
+    def proba(X_norm):
+        # llamada directa: evita el coste fijo de model.predict en lotes pequeños
+        return modelo(X_norm, training=False).numpy()
+    return proba
+
+# ---------------------- EVALUACIÓN ----------------------
+def evaluar_lote(cascada, X, y, nombre):
+    cascada.reiniciar_estadisticas()
+    etapas = np.empty(len(X), dtype=np.int8)
+    t0 = time.perf_counter()
+    pred = np.argmax(cascada.predecir_proba(X, etapas), axis=1)
+    dt = time.perf_counter() - t0
+    acierto = pred == y
+    print(f"\n[{nombre}] {cascada.resumen()}")
+    print(f"  precisión extremo a extremo: {acierto.mean():.4f}")
+    for etapa, desc in ((0, "rápida"), (1, "lenta")):
+        mask = etapas == etapa
+        if mask.any():
+            print(f"  precisión etapa {desc}: {acierto[mask].mean():.4f} ({mask.sum()} frames)")
+    print(f"  tiempo total: {dt * 1000:.1f} ms")
+
+def evaluar_frame_a_frame(cascada, X, y, nombre):
+    """Simula el bucle en vivo: un frame por llamada, como en deteccion_tiempo_real.py."""
+    cascada.reiniciar_estadisticas()
+    aciertos = 0
+    t0 = time.perf_counter()
+    for i in range(len(X)):
+        aciertos += int(np.argmax(cascada.predecir_proba(X[i:i + 1])) == y[i])
+    dt = time.perf_counter() - t0
+    print(f"\n[{nombre}] {cascada.resumen()}")
+    print(f"  precisión extremo a extremo: {aciertos / max(len(X), 1):.4f}")
+    print(f"  latencia media por frame: {dt / max(len(X), 1) * 1000:.3f} ms")
+
+def landmarks_de_clips(label2id, frame_step):
+    """Extrae (X_norm, y) de los clips de videos_proc. La carpeta se compara con las etiquetas
+       sin distinguir mayúsculas (videos_proc/L es la clase 'l'); las que no tienen etiqueta se avisan.
+    """
+    from replay_clips import iterar_clips
+    from procesamiento_landmarks import hand_landmarks_to_vec
+    por_nombre = {k.upper(): v for k, v in label2id.items()}
+    sin_etiqueta = set()
+    X, y = [], []
+    for letra, _, _, _, _, results in iterar_clips(frame_step=frame_step):
+        clase = por_nombre.get(letra.upper())
+        if clase is None:
+            if letra not in sin_etiqueta:
+                sin_etiqueta.add(letra)
+                print(f"AVISO: la carpeta '{letra}' no está en label2id.json, se salta.")
+            continue
+        if not results.multi_hand_landmarks:
+            continue
+        X.append(hand_landmarks_to_vec(results.multi_hand_landmarks[0]))
+        y.append(clase)
+    X = np.asarray(X, dtype=np.float32).reshape(-1, N_FEATURES)
+    return center_and_scale_batch(X), np.asarray(y, dtype=np.int32)
+
+# ---------------------- RUN ----------------------
+def main():
+    parser = argparse.ArgumentParser(description="Cascada etapa rápida + modelo Keras con compuerta de confianza.")
+    parser.add_argument("--entrenar", action="store_true", help="entrenar y guardar la etapa lineal")
+    parser.add_argument("--evaluar", action="store_true", help="evaluar en X_test.npy")
+    parser.add_argument("--clips", action="store_true", help="evaluar también reproduciendo videos_proc")
+    parser.add_argument("--frame-step", type=int, default=3)
+    parser.add_argument("--etapa-rapida", choices=("lineal", "prototipos", "knn"), default=ETAPA_RAPIDA)
+    parser.add_argument("--umbral", type=float, default=UMBRAL)
+    args = parser.parse_args()
+
+    label2id = load_label2id()
+    if args.entrenar:
+        X, y = load_clean_splits(("train", "val"))
+        t0 = time.perf_counter()
+        lineal = ClasificadorLineal().ajustar(X, y, len(label2id))
+        lineal.guardar(LINEAR_PATH)
+        print(f"Etapa lineal entrenada en {time.perf_counter() - t0:.1f}s y guardada en {LINEAR_PATH}")
+
+    if not args.evaluar:
+        return
+
+    cascada = CascadaClasificadores(cargar_etapa_rapida(args.etapa_rapida), cargar_etapa_lenta(), args.umbral)
+    X_test, y_test = load_clean_splits(("test",))
+    evaluar_lote(cascada, X_test, y_test, "X_test, por lote")
+    evaluar_frame_a_frame(cascada, X_test, y_test, "X_test, frame a frame")
+
+    if args.clips:
+        X_clips, y_clips = landmarks_de_clips(label2id, args.frame_step)
+        print(f"\nClips reproducidos: {len(X_clips)} frames con mano detectada.")
+        evaluar_frame_a_frame(cascada, X_clips, y_clips, "videos_proc, frame a frame")
+
+if __name__ == "__main__":
+    main()
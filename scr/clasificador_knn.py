@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+clasificador_knn.py
+Clasificador por vecinos más cercanos (kNN) o prototipos de clase sobre los landmarks
+normalizados de dataset_landmarks_limpios. Sirve como alternativa al modelo Keras:
+una seña nueva se agrega ("enrola") en segundos sin volver a entrenar.
+
+Uso:
+ - Construir el índice a partir del dataset limpio:
+     python scr/clasificador_knn.py --construir
+ - Enrolar una seña nueva grabada con captura_foto__landmarks_.py:
+     python scr/clasificador_knn.py --enrolar dataset_landmarks/HOLA.csv
+   (la etiqueta es el nombre del archivo; se puede cambiar con --etiqueta)
+
+El índice se guarda en INDEX_PATH y el detector en tiempo real lo usa cuando
+CLASSIFIER_BACKEND = "knn" en deteccion_tiempo_real.py.
+"""
+
+import os
+import json
+import argparse
+from pathlib import Path
+import numpy as np
+
+from procesamiento_landmarks import (
+    center_and_scale_batch, load_clean_splits, load_label2id, read_landmark_csv, N_FEATURES
+)
+
+# -------------------------
+# Config
+# -------------------------
+INDEX_PATH = "modelo/indice_knn.npz"
+K_VECINOS = 5
+MODO = "knn"            # "knn" (vecinos) o "prototipos" (centroide por clase)
+TEMPERATURA = 0.05      # suavizado del softmax sobre distancias en modo prototipos
+BATCH_CONSULTA = 1024   # filas de consulta por bloque al calcular distancias
+
+
+class ClasificadorVecinos:
+    """Índice vectorizado sobre vectores normalizados (N,63).
+       Las distancias se calculan por lotes con ||a||² - 2·a·b + ||b||² (una sola multiplicación de matrices).
+    """
+
+    def __init__(self, k=K_VECINOS, modo=MODO, temperatura=TEMPERATURA):
+        if modo not in ("knn", "prototipos"):
+            raise ValueError(f"Modo desconocido: {modo}. Usa 'knn' o 'prototipos'.")
+        self.k = k
+        self.modo = modo
+        self.temperatura = temperatura
+        self.X = np.empty((0, N_FEATURES), dtype=np.float32)
+        self.y = np.empty((0,), dtype=np.int32)
+        self.label2id = {}
+        self.id2label = {}
+        self._refrescar()
+
+    # ---------------------- CONSTRUCCIÓN ----------------------
+    def ajustar(self, X, y, label2id):
+        """X ya normalizado (como en dataset_landmarks_limpios), y con ids enteros."""
+        self.X = np.ascontiguousarray(X, dtype=np.float32)
+        self.y = np.asarray(y, dtype=np.int32)
+        self.label2id = {k: int(v) for k, v in label2id.items()}
+        self._refrescar()
+        return self
+
+    def enrolar(self, etiqueta, X_crudo):
+        """Agrega ejemplos de una seña (landmarks crudos, se normalizan aquí).
+           Si la etiqueta ya existe, los ejemplos se suman a esa clase.
+        """
+        X_norm = center_and_scale_batch(X_crudo)
+        if len(X_norm) == 0:
+            raise ValueError(f"No hay ejemplos válidos para enrolar '{etiqueta}'.")
+        if etiqueta not in self.label2id:
+            self.label2id[etiqueta] = max(self.label2id.values(), default=-1) + 1
+        clase = self.label2id[etiqueta]
+        self.X = np.vstack([self.X, X_norm])
+        self.y = np.concatenate([self.y, np.full(len(X_norm), clase, dtype=np.int32)])
+        self._refrescar()
+        return len(X_norm)
+
+    def _refrescar(self):
+        """Recalcula los datos derivados (normas, prototipos) tras ajustar/enrolar."""
+        self.id2label = {v: k for k, v in self.label2id.items()}
+        self.num_clases = max(self.label2id.values(), default=-1) + 1
+        if self.modo == "prototipos" and len(self.X):
+            conteo = np.bincount(self.y, minlength=self.num_clases).astype(np.float32)
+            suma = np.zeros((self.num_clases, N_FEATURES), dtype=np.float32)
+            np.add.at(suma, self.y, self.X)
+            presentes = conteo > 0
+            self._ref = suma[presentes] / conteo[presentes, None]
+            self._ref_y = np.flatnonzero(presentes).astype(np.int32)
+        else:
+            self._ref = self.X
+            self._ref_y = self.y
+        self._ref_sq = np.einsum("ij,ij->i", self._ref, self._ref)
+
+    # ---------------------- CONSULTA ----------------------
+    def _distancias2(self, Q):
+        """Distancias euclídeas al cuadrado entre Q (M,63) y las referencias (R,63)."""
+        q_sq = np.einsum("ij,ij->i", Q, Q)
+        d2 = q_sq[:, None] - 2.0 * (Q @ self._ref.T) + self._ref_sq[None, :]
+        np.maximum(d2, 0.0, out=d2)
+        return d2
+
+    def predecir_proba(self, X_norm):
+        """Devuelve una matriz (M, num_clases) de probabilidades para vectores ya normalizados."""
+        X_norm = np.ascontiguousarray(np.atleast_2d(X_norm), dtype=np.float32)
+        if len(self._ref) == 0:
+            raise RuntimeError("El índice está vacío: usa ajustar() o cargar() antes de predecir.")
+        salida = np.zeros((len(X_norm), self.num_clases), dtype=np.float32)
+        for ini in range(0, len(X_norm), BATCH_CONSULTA):
+            Q = X_norm[ini:ini + BATCH_CONSULTA]
+            d2 = self._distancias2(Q)
+            bloque = salida[ini:ini + BATCH_CONSULTA]
+            if self.modo == "prototipos":
+                logits = -np.sqrt(d2) / self.temperatura
+                logits -= logits.max(axis=1, keepdims=True)
+                p = np.exp(logits)
+                p /= p.sum(axis=1, keepdims=True)
+                bloque[:, self._ref_y] = p
+            else:
+                k = min(self.k, d2.shape[1])
+                vecinos = np.argpartition(d2, k - 1, axis=1)[:, :k]
+                filas = np.arange(len(Q))[:, None]
+                # voto ponderado por la inversa de la distancia
+                pesos = 1.0 / (np.sqrt(d2[filas, vecinos]) + 1e-6)
+                np.add.at(bloque, (np.broadcast_to(filas, vecinos.shape), self._ref_y[vecinos]), pesos)
+                bloque /= bloque.sum(axis=1, keepdims=True)
+        return salida
+
+    def predecir(self, X_norm):
+        return np.argmax(self.predecir_proba(X_norm), axis=1)
+
+    # ---------------------- PERSISTENCIA ----------------------
+    def guardar(self, path=INDEX_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, X=self.X, y=self.y,
+                            label2id=json.dumps(self.label2id, ensure_ascii=False),
+                            config=json.dumps({"k": self.k, "modo": self.modo, "temperatura": self.temperatura}))
+
+    @classmethod
+    def cargar(cls, path=INDEX_PATH, **overrides):
+        data = np.load(path, allow_pickle=False)
+        config = json.loads(str(data["config"]))
+        config.update(overrides)
+        clf = cls(**config)
+        return clf.ajustar(data["X"], data["y"], json.loads(str(data["label2id"])))
+
+
+def construir_desde_dataset(splits=("train", "val"), **kwargs):
+    X, y = load_clean_splits(splits)
+    return ClasificadorVecinos(**kwargs).ajustar(X, y, load_label2id())
+
+# ---------------------- RUN ----------------------
+def main():
+    parser = argparse.ArgumentParser(description="Índice kNN / prototipos para enrolar señas sin reentrenar.")
+    parser.add_argument("--construir", action="store_true", help="construir el índice desde dataset_landmarks_limpios")
+    parser.add_argument("--enrolar", nargs="*", default=[], help="CSV(s) de dataset_landmarks a enrolar")
+    parser.add_argument("--etiqueta", default=None, help="etiqueta para el CSV enrolado (por defecto, nombre del archivo)")
+    parser.add_argument("--modo", choices=("knn", "prototipos"), default=None)
+    parser.add_argument("--indice", default=INDEX_PATH)
+    args = parser.parse_args()
+
+    overrides = {"modo": args.modo} if args.modo else {}
+    if args.construir or not os.path.exists(args.indice):
+        print("Construyendo índice desde el dataset limpio...")
+        clf = construir_desde_dataset(**overrides)
+    else:
+        clf = ClasificadorVecinos.cargar(args.indice, **overrides)
+
+    if args.etiqueta and len(args.enrolar) != 1:
+        parser.error("--etiqueta solo se puede usar con un único CSV.")
+    for csv_path in args.enrolar:
+        etiqueta = args.etiqueta or Path(csv_path).stem
+        n = clf.enrolar(etiqueta, read_landmark_csv(csv_path))
+        print(f"Enrolada '{etiqueta}' (id {clf.label2id[etiqueta]}) con {n} ejemplos.")
+
+    clf.guardar(args.indice)
+    print(f"Índice guardado en {args.indice}: {len(clf.X)} ejemplos, {len(clf.label2id)} clases, modo={clf.modo}.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+decodificador_deletreo.py
+Decodificador en streaming para deletreo (alfabeto dactilológico):
+- Convierte el flujo de probabilidades por frame del clasificador en letras confirmadas
+  usando reglas de permanencia (N frames seguidos con la misma letra) y confianza mínima.
+- Para repetir la misma letra hay que "soltarla" unos frames (otra letra, baja confianza o sin mano).
+- Varios frames seguidos sin mano cierran la palabra actual.
+- La palabra parcial se sigue en un trie del léxico (lexico/palabras_es.txt); cada nodo guarda
+  sus mejores sugerencias precalculadas, así que avanzar y sugerir cuesta O(1) por frame.
+
+Uso headless sobre los clips de videos_proc (mide también la latencia que añade el decodificador):
+     python scr/decodificador_deletreo.py --replay [--backend knn|keras]
+"""
+
+import os
+import time
+import argparse
+import unicodedata
+import numpy as np
+
+# -------------------------
+# Config
+# -------------------------
+LEXICON_PATH = "lexico/palabras_es.txt"
+UMBRAL_CONFIANZA = 0.80    # probabilidad mínima para contar un frame hacia la permanencia
+FRAMES_PERMANENCIA = 8     # frames seguidos con la misma letra para confirmarla
+FRAMES_ESPACIO = 15        # frames seguidos sin mano para cerrar la palabra
+FRAMES_SOLTAR = 3          # frames sin la última letra para poder repetirla
+MAX_SUGERENCIAS = 3
+
+
+def normalizar_texto(s):
+    """Mayúsculas y sin tildes (el alfabeto dactilológico no las distingue).
+       La Ñ se conserva: es una letra propia del alfabeto, no una N con tilde.
+    """
+    s = unicodedata.normalize("NFD", s.strip().upper()).replace("N\u0303", "Ñ")
+    return "".join(c for c in s if unicodedata.category(c) != "Mn")
+
+# ---------------------- TRIE ----------------------
+class NodoTrie:
+    __slots__ = ("hijos", "fin", "sugerencias")
+
+    def __init__(self):
+        self.hijos = {}
+        self.fin = False
+        self.sugerencias = ()
+
+
+class TrieLexico:
+    """Trie de palabras con frecuencia. Las sugerencias (top-k palabras bajo cada prefijo)
+       se calculan una vez al construir, no en cada frame.
+    """
+
+    def __init__(self, palabras_frecuencia, max_sugerencias=MAX_SUGERENCIAS):
+        self.raiz = NodoTrie()
+        self.max_sugerencias = max_sugerencias
+        for palabra, freq in palabras_frecuencia.items():
+            nodo = self.raiz
+            for letra in palabra:
+                nodo = nodo.hijos.setdefault(letra, NodoTrie())
+            nodo.fin = True
+        self._precalcular(self.raiz, "", palabras_frecuencia)
+
+    def _precalcular(self, nodo, prefijo, freqs):
+        """Post-orden: las sugerencias de un nodo son las mejores entre él y sus hijos."""
+        candidatas = [(freqs[prefijo], prefijo)] if nodo.fin else []
+        for letra, hijo in nodo.hijos.items():
+            self._precalcular(hijo, prefijo + letra, freqs)
+            candidatas.extend((freqs[p], p) for p in hijo.sugerencias)
+        candidatas.sort(key=lambda fp: (-fp[0], fp[1]))
+        nodo.sugerencias = tuple(p for _, p in candidatas[:self.max_sugerencias])
+
+    @classmethod
+    def desde_archivo(cls, path=LEXICON_PATH, **kwargs):
+        freqs = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for linea in f:
+                linea = linea.strip()
+                if not linea or linea.startswith("#"):
+                    continue
+                partes = linea.split()
+                palabra = normalizar_texto(partes[0])
+                freq = float(partes[1]) if len(partes) > 1 else 1.0
+                if palabra.isalpha():
+                    freqs[palabra] = max(freq, freqs.get(palabra, 0.0))
+        return cls(freqs, **kwargs)
+
+# ---------------------- DECODIFICADOR ----------------------
+class DecodificadorDeletreo:
+    """Se alimenta con actualizar(probs) una vez por frame (probs=None si no hay mano).
+       Estado visible: palabra (parcial), texto (palabras cerradas), sugerencias().
+    """
+
+    def __init__(self, id2label, trie=None, umbral=UMBRAL_CONFIANZA,
+                 frames_permanencia=FRAMES_PERMANENCIA, frames_espacio=FRAMES_ESPACIO,
+                 frames_soltar=FRAMES_SOLTAR):
+        self.id2label = {int(k): v for k, v in id2label.items()}
+        # símbolo que aporta cada clase: letra única (A..Z, 'l' -> 'L') o la seña completa ("ME GUSTA", "10")
+        self._simbolo = {k: normalizar_texto(v) for k, v in self.id2label.items()}
+        self.trie = trie
+        self.umbral = umbral
+        self.frames_permanencia = frames_permanencia
+        self.frames_espacio = frames_espacio
+        self.frames_soltar = frames_soltar
+        self.texto = []
+        self.reiniciar_palabra()
+        self._candidato = None
+        self._racha = 0
+        self._sin_mano = 0
+        self._ultimo_confirmado = None   # letra que hay que soltar antes de repetirla
+        self._frames_fuera = 0
+
+    def reiniciar_palabra(self):
+        self.palabra = ""
+        self._nodos = [self.trie.raiz] if self.trie else []   # pila de nodos: deshacer es O(1)
+
+    def sugerencias(self):
+        if not self._nodos or self._nodos[-1] is None:
+            return ()
+        return self._nodos[-1].sugerencias
+
+    def actualizar(self, probs):
+        """Procesa un frame. Devuelve el símbolo confirmado en este frame o None."""
+        top = None
+        if probs is not None:
+            self._sin_mano = 0
+            top = int(np.argmax(probs))
+            if probs[top] < self.umbral:
+                top = None
+        else:
+            self._sin_mano += 1
+            if self._sin_mano == self.frames_espacio:
+                self.cerrar_palabra()
+
+        # la última letra confirmada se "suelta" tras unos frames sin verla (evita duplicar por parpadeos)
+        if top is not None and top == self._ultimo_confirmado:
+            self._frames_fuera = 0
+        else:
+            self._frames_fuera += 1
+            if self._frames_fuera >= self.frames_soltar:
+                self._ultimo_confirmado = None
+
+        if top is None:
+            self._candidato, self._racha = None, 0
+            return None
+        if top != self._candidato:
+            self._candidato, self._racha = top, 0
+        self._racha += 1
+        if self._racha < self.frames_permanencia or top == self._ultimo_confirmado:
+            return None
+
+        self._ultimo_confirmado = top
+        self._frames_fuera = 0
+        simbolo = self._simbolo.get(top, str(top))
+        if len(simbolo) == 1 and simbolo.isalpha():
+            self._agregar_letra(simbolo)
+        else:
+            # señas completas ("ME GUSTA", números) van como palabra propia
+            self.cerrar_palabra()
+            self.texto.append(simbolo)
+        return simbolo
+
+    def _agregar_letra(self, letra):
+        self.palabra += letra
+        if self._nodos:
+            nodo = self._nodos[-1]
+            self._nodos.append(nodo.hijos.get(letra) if nodo is not None else None)
+
+    def borrar_letra(self):
+        if self.palabra:
+            self.palabra = self.palabra[:-1]
+            if len(self._nodos) > 1:
+                self._nodos.pop()
+
+    def aceptar_sugerencia(self, i=0):
+        sugs = self.sugerencias()
+        if i < len(sugs):
+            self.texto.append(sugs[i])
+            self.reiniciar_palabra()
+
+    def cerrar_palabra(self):
+        if self.palabra:
+            self.texto.append(self.palabra)
+            self.reiniciar_palabra()
+
+    def texto_completo(self):
+        return " ".join(self.texto + ([self.palabra] if self.palabra else []))
+
+# ---------------------- REPLAY HEADLESS ----------------------
+def cargar_backend(backend):
+    """Devuelve (predecir_proba(X_norm), id2label)."""
+    if backend == "keras":
+        from cascada import cargar_etapa_lenta
+        from procesamiento_landmarks import load_label2id
+        label2id = load_label2id()
+        return cargar_etapa_lenta(), {v: k for k, v in label2id.items()}
+    from clasificador_knn import ClasificadorVecinos, construir_desde_dataset, INDEX_PATH
+    clf = ClasificadorVecinos.cargar(INDEX_PATH) if os.path.exists(INDEX_PATH) else construir_desde_dataset()
+    return clf.predecir_proba, clf.id2label
+
+def replay(backend="knn", frame_step=1):
+    from replay_clips import iterar_clips
+    from procesamiento_landmarks import hand_landmarks_to_vec, center_and_scale_batch
+
+    predecir_proba, id2label = cargar_backend(backend)
+    trie = TrieLexico.desde_archivo()
+    dec = None
+    clip_actual = letra_actual = None
+    tiempos = []
+    aciertos = total_clips = 0
+
+    def cerrar_clip():
+        nonlocal aciertos, total_clips
+        if dec is None:
+            return
+        dec.cerrar_palabra()
+        salida = dec.texto_completo()
+        esperado = normalizar_texto(letra_actual)
+        ok = f" {esperado} " in f" {salida} "   # palabra completa (también señas de varias palabras)
+        aciertos += int(ok)
+        total_clips += 1
+        print(f"  {clip_actual}: esperado '{esperado}' -> decodificado '{salida}'{'' if ok else '  (X)'}")
+
+    for letra, clip, _, _, _, results in iterar_clips(frame_step=frame_step):
+        if clip != clip_actual:
+            cerrar_clip()
+            clip_actual, letra_actual = clip, letra
+            dec = DecodificadorDeletreo(id2label, trie)
+        probs = None
+        if results.multi_hand_landmarks:
+            x = center_and_scale_batch(hand_landmarks_to_vec(results.multi_hand_landmarks[0])[None, :])
+            probs = predecir_proba(x)[0]
+        t0 = time.perf_counter()
+        dec.actualizar(probs)
+        tiempos.append(time.perf_counter() - t0)
+    cerrar_clip()
+
+    if tiempos:
+        t = np.asarray(tiempos) * 1e6
+        print(f"\nClips con la letra esperada decodificada: {aciertos}/{total_clips}")
+        print(f"Latencia del decodificador por frame: media={t.mean():.1f} µs, p99={np.percentile(t, 99):.1f} µs")
+
+def main():
+    parser = argparse.ArgumentParser(description="Decodificador de deletreo con léxico en trie.")
+    parser.add_argument("--replay", action="store_true", help="reproducir videos_proc sin ventana")
+    parser.add_argument("--backend", choices=("knn", "keras"), default="knn")
+    parser.add_argument("--frame-step", type=int, default=1)
+    args = parser.parse_args()
+    if args.replay:
+        replay(args.backend, args.frame_step)
+    else:
+        parser.print_help()
+
+if __name__ == "__main__":
+    main()
@@ -1,78 +1,208 @@
 import cv2
+import time
 import numpy as np
-import mediapipe as mp
-import tensorflow as tf
 import json
 
+from procesamiento_landmarks import center_and_scale_batch, pack_hands, N_FEATURES
+from buffers_frame import ProcesadorFrame
+
 # ---------------------------------------
-# 1. CARGAR MODELO Y ETIQUETAS
+# 0. CONFIGURACIÓN
 # ---------------------------------------
 
-modelo = tf.keras.models.load_model(
-    "C:/Users/julia/OneDrive PolitecnicoGrancolombombiano/Documentos/U/SEMESTRE 6/SISTEMAS OPERACIONALES/PROG/proyecto/Reconocimiento_Senias/modelo/modelo_signos.h5"
-)
+# "keras":   modelo_signos.h5 entrenado en 02_entrenamiento_modelo.ipynb
+# "knn":     índice de vecinos de clasificador_knn.py (permite enrolar señas nuevas sin reentrenar)
+# "cascada": etapa rápida (cascada.py, entrenar antes con --entrenar) y modelo Keras solo para los frames ambiguos
+CLASSIFIER_BACKEND = "keras"
+KNN_INDEX_PATH = "modelo/indice_knn.npz"
+CASCADE_THRESHOLD = 0.90
 
-with open("dataset_landmarks_limpios/label2id.json", "r", encoding="utf-8") as f:
-    label2id = json.load(f)
+# Manos a detectar: todas se clasifican juntas en una sola llamada (entrada (n_manos, 63))
+MAX_NUM_HANDS = 2
 
-id2label = {v: k for k, v in label2id.items()}
+# Deletreo: confirma letras por permanencia y sugiere palabras del léxico (decodificador_deletreo.py)
+# TAB = aceptar la primera sugerencia, BACKSPACE = borrar la última letra
+SPELLING_ENABLED = True
+
+# Recolección: guarda en segundo plano las manos con baja confianza (recoleccion_muestras.py)
+# en dataset_landmarks_dudosos/<letra_predicha>.csv para revisarlas y reentrenar
+HARVEST_ENABLED = False
+HARVEST_THRESHOLD = 0.60
 
 # ---------------------------------------
-# 2. CONFIGURAR MEDIAPIPE (API NUEVA)
+# 1. CARGAR MODELO Y ETIQUETAS
 # ---------------------------------------
 
-mp_hands = mp.solutions.hands
+def cargar_clasificador():
+    """Devuelve (predecir_proba, id2label, cascada|None) según CLASSIFIER_BACKEND."""
+    if CLASSIFIER_BACKEND == "knn":
+        from clasificador_knn import ClasificadorVecinos
 
-hands = mp_hands.Hands(
-    model_complexity=1,
-    max_num_hands=1,
-    min_detection_confidence=0.7,
-    min_tracking_confidence=0.7
-)
+        clasificador = ClasificadorVecinos.cargar(KNN_INDEX_PATH)
+        return clasificador.predecir_proba, clasificador.id2label, None
 
+    import tensorflow as tf
 
-# ---------------------------------------
-# 3. INICIAR CAMARA
-# ---------------------------------------
+    modelo = tf.keras.models.load_model(
+        "C:/Users/julia/OneDrive PolitecnicoGrancolombombiano/Documentos/U/SEMESTRE 6/SISTEMAS OPERACIONALES/PROG/proyecto/Reconocimiento_Senias/modelo/modelo_signos.h5"
+    )
+
+    with open("dataset_landmarks_limpios/label2id.json", "r", encoding="utf-8") as f:
+        label2id = json.load(f)
+
+    id2label = {v: k for k, v in label2id.items()}
+
+    def predecir_proba(entrada):
+        # llamada directa: model.predict tiene un coste fijo alto para lotes de 1-2 filas
+        return modelo(entrada, training=False).numpy()
+
+    if CLASSIFIER_BACKEND == "cascada":
+        from cascada import CascadaClasificadores, cargar_etapa_rapida
+
+        cascada = CascadaClasificadores(cargar_etapa_rapida(), predecir_proba, CASCADE_THRESHOLD)
+        return cascada.predecir_proba, id2label, cascada
+
+    return predecir_proba, id2label, None
+
+
+# Todo lo demás va dentro de main(): la recolección usa un proceso de fondo y en Windows
+# (spawn) el proceso hijo vuelve a importar este archivo; sin el guard al final
+# volvería a cargar el modelo y a abrir la cámara. Por lo mismo TensorFlow y MediaPipe se
+# importan dentro de las funciones: el escritor de fondo solo necesita cv2 y numpy.
+def main():
+    import mediapipe as mp
+
+    predecir_proba, id2label, cascada = cargar_clasificador()
+
+    # ---------------------------------------
+    # 2. CONFIGURAR MEDIAPIPE (API NUEVA)
+    # ---------------------------------------
+
+    mp_hands = mp.solutions.hands
+    mp_drawing = mp.solutions.drawing_utils
+
+    hands = mp_hands.Hands(
+        model_complexity=1,
+        max_num_hands=MAX_NUM_HANDS,
+        min_detection_confidence=0.7,
+        min_tracking_confidence=0.7
+    )
+
+
+    if SPELLING_ENABLED:
+        from decodificador_deletreo import DecodificadorDeletreo, TrieLexico
+
+        decodificador = DecodificadorDeletreo(id2label, TrieLexico.desde_archivo())
+
+    if HARVEST_ENABLED:
+        from recoleccion_muestras import RecolectorMuestras
+
+        recolector = RecolectorMuestras(id2label, umbral=HARVEST_THRESHOLD)
+
+
+    # ---------------------------------------
+    # 3. INICIAR CAMARA
+    # ---------------------------------------
+
+    cap = cv2.VideoCapture(0)
+    procesador = ProcesadorFrame(espejo=False)
+
+    # buffer fijo: una fila de 63 valores por mano
+    entrada_manos = np.zeros((MAX_NUM_HANDS, N_FEATURES), dtype=np.float32)
+    # tiempo de clasificación acumulado por número de manos: n -> [frames, segundos]
+    tiempo_por_manos = {}
 
-cap = cv2.VideoCapture(0)
-print("Cámara iniciada. Presiona 'q' para salir.")
+    print("Cámara iniciada. Presiona 'q' para salir.")
 
-while True:
-    ret, frame = cap.read()
-    if not ret:
-        break
+    while True:
+        ret, frame = procesador.leer(cap)
+        if not ret:
+            break
 
-    rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-    results = hands.process(rgb)
+        frame, rgb = procesador.procesar(frame)
+        results = hands.process(rgb)
 
-    landmarks_list = []
+        if results.multi_hand_landmarks:
+            # la cámara no va en espejo: se invierte la lateralidad que reporta MediaPipe
+            n_manos, lados = pack_hands(results.multi_hand_landmarks, results.multi_handedness,
+                                        entrada_manos, invertir_lateralidad=not procesador.espejo)
 
-    if results.multi_hand_landmarks:
-        for hand_landmarks in results.multi_hand_landmarks:
+            # mismo preprocesamiento que el dataset limpio (centrar en muñeca y escalar), todas las manos en un lote
+            t0 = time.perf_counter()
+            entrada = center_and_scale_batch(entrada_manos[:n_manos])
+            pred = predecir_proba(entrada)
+            stats = tiempo_por_manos.setdefault(n_manos, [0, 0.0])
+            stats[0] += 1
+            stats[1] += time.perf_counter() - t0
 
-            mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+            if HARVEST_ENABLED:
+                # landmarks crudos (mismo formato que dataset_landmarks); la miniatura se recorta
+                # antes de dibujar el esqueleto y el texto sobre el frame
+                for i in range(n_manos):
+                    recolector.ofrecer(entrada_manos[i], pred[i], frame)
 
-            for l in hand_landmarks.landmark:
-                landmarks_list.extend([l.x, l.y, l.z])
+            for hand_landmarks in results.multi_hand_landmarks:
+                mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
 
-        entrada = np.array(landmarks_list).reshape(1, -1)
+            indices = np.argmax(pred, axis=1)
+            h, w = frame.shape[:2]
+            for i in range(n_manos):
+                letra = id2label[int(indices[i])]
+                cv2.putText(frame, f"{lados[i]}: {letra} ({pred[i, indices[i]]:.2f})", (10, 40 + 35 * i),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0,255,0), 2)
+                # etiqueta junto a la muñeca de cada mano
+                muneca = results.multi_hand_landmarks[i].landmark[0]
+                cv2.putText(frame, letra, (int(muneca.x * w), int(muneca.y * h) + 30),
+                            cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0,255,255), 2)
 
-        pred = modelo.predict(entrada, verbose=0)
-        index_pred = np.argmax(pred)
-        letra = id2label[index_pred]
+            if SPELLING_ENABLED:
+                # se deletrea con la mano más segura del frame
+                mejor = int(np.argmax(pred[np.arange(n_manos), indices]))
+                decodificador.actualizar(pred[mejor])
 
-        cv2.putText(frame, f"Letra: {letra}", (10, 40),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0,255,0), 2)
+        else:
+            cv2.putText(frame, "No se detecta mano", (10, 40),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 2)
 
-    else:
-        cv2.putText(frame, "No se detecta mano", (10, 40),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,255), 2)
+            if SPELLING_ENABLED:
+                decodificador.actualizar(None)
+
+        if SPELLING_ENABLED:
+            h = frame.shape[0]
+            cv2.putText(frame, f"Palabra: {decodificador.palabra}", (10, h - 70),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255,255,0), 2)
+            cv2.putText(frame, "Sugerencias: " + " | ".join(decodificador.sugerencias()), (10, h - 40),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200,200,200), 1)
+            cv2.putText(frame, decodificador.texto_completo()[-40:], (10, h - 12),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255,255,255), 1)
 
-    cv2.imshow("Reconocimiento de Letras", frame)
+        cv2.imshow("Reconocimiento de Letras", frame)
 
-    if cv2.waitKey(1) & 0xFF == ord('q'):
-        break
+        key = cv2.waitKey(1) & 0xFF
+        if key == ord('q'):
+            break
+        elif SPELLING_ENABLED and key == 9:     # TAB
+            decodificador.aceptar_sugerencia(0)
+        elif SPELLING_ENABLED and key == 8:     # BACKSPACE
+            decodificador.borrar_letra()
 
-cap.release()
-cv2.destroyAllWindows()
+    cap.release()
+    cv2.destroyAllWindows()
+    print("Memoria por frame:", procesador.resumen())
+
+    for n, (frames_n, segundos) in sorted(tiempo_por_manos.items()):
+        print(f"Clasificación con {n} mano(s): {frames_n} frames, {segundos / frames_n * 1000:.2f} ms/frame")
+
+    if CLASSIFIER_BACKEND == "cascada":
+        print("Cascada:", cascada.resumen())
+
+    if SPELLING_ENABLED:
+        print("Texto deletreado:", decodificador.texto_completo())
+
+    if HARVEST_ENABLED:
+        recolector.cerrar()
+        print("Recolección:", recolector.resumen())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+entrenamiento_modelo.py
+Versión en script de 02_entrenamiento_modelo.ipynb con aumentación al vuelo (aumentacion.py):
+cada época ve versiones rotadas, espejadas, escaladas y con ruido de X_train en lugar de
+las mismas muestras, sin necesidad de grabar más video.
+
+Uso:
+     python scr/entrenamineto_modelo.py
+"""
+
+import os
+import pickle
+import tensorflow as tf
+from tensorflow.keras.models import Sequential
+from tensorflow.keras.layers import Dense, Dropout
+
+from procesamiento_landmarks import load_clean_splits, load_label2id
+from aumentacion import GeneradorAumentado, medir_rendimiento, BATCH_SIZE
+
+# -------------------------
+# Config
+# -------------------------
+MODEL_OUT = "modelo/modelo_signos_aumentado.h5"   # cambiar a modelo/modelo_signos.h5 para reemplazar el del detector
+EPOCHS = 50
+PROPORCION_ORIGINAL = 0.25   # fracción de cada lote que se deja sin aumentar
+
+
+def construir_modelo(input_dim, num_classes):
+    # misma arquitectura que el notebook
+    model = Sequential([
+        Dense(256, activation='relu', input_shape=(input_dim,)),
+        Dropout(0.3),
+        Dense(128, activation='relu'),
+        Dropout(0.25),
+        Dense(num_classes, activation='softmax')
+    ])
+    model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['accuracy'])
+    return model
+
+def main():
+    label2id = load_label2id()
+    id2label = {int(v): k for k, v in label2id.items()}
+    num_classes = len(label2id)
+
+    X_train, y_train = load_clean_splits(("train",))
+    X_val, y_val = load_clean_splits(("val",))
+    X_test, y_test = load_clean_splits(("test",))
+    print("Shapes:", X_train.shape, X_val.shape, X_test.shape, "| clases:", num_classes)
+
+    gen = GeneradorAumentado(X_train, y_train, num_classes, batch_size=BATCH_SIZE,
+                             proporcion_original=PROPORCION_ORIGINAL)
+    # se mide con otra instancia para que el de entrenamiento empiece la época desde el inicio
+    gen_medicion = GeneradorAumentado(X_train, y_train, num_classes, batch_size=BATCH_SIZE,
+                                      proporcion_original=PROPORCION_ORIGINAL)
+    print(f"Aumentación: {medir_rendimiento(gen_medicion):,.0f} muestras/s "
+          f"({gen.steps_per_epoch} lotes por época de {BATCH_SIZE})")
+
+    model = construir_modelo(X_train.shape[1], num_classes)
+    model.summary()
+
+    y_val_ohe = tf.keras.utils.to_categorical(y_val, num_classes)
+    model.fit(
+        gen.lotes(),
+        steps_per_epoch=gen.steps_per_epoch,
+        validation_data=(X_val, y_val_ohe),
+        epochs=EPOCHS,
+        verbose=2
+    )
+
+    y_test_ohe = tf.keras.utils.to_categorical(y_test, num_classes)
+    loss, acc = model.evaluate(X_test, y_test_ohe, verbose=0)
+    print("Test loss:", loss, "   Test accuracy:", acc)
+
+    os.makedirs(os.path.dirname(MODEL_OUT), exist_ok=True)
+    model.save(MODEL_OUT)
+    print("Modelo guardado en", MODEL_OUT)
+
+    with open(os.path.join(os.path.dirname(MODEL_OUT), "id2label.pkl"), "wb") as f:
+        pickle.dump(id2label, f)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+escritura_segundo_plano.py
+Escritores en procesos de fondo para que el bucle de captura no espere al disco ni al codificador:
+- EscritorVideo: recibe frames BGR y los codifica con cv2.VideoWriter en otro proceso.
+- EscritorFuncion: recibe tuplas de argumentos y llama a una función de escritura
+  (p. ej. save_landmarks_csv) en otro proceso.
+
+Las colas son acotadas: si el proceso de fondo no da abasto, el elemento se descarta
+(no se bloquea la captura) y se cuenta en `descartados`. Si el proceso de fondo murió
+(p. ej. una excepción al escribir), lo que llega después se cuenta en `perdidos` y se avisa.
+
+Importante: multiprocessing.Queue serializa en un hilo aparte, después de put(). Si el frame
+viene de un buffer reutilizado (buffers_frame.py) hay que enviar una copia.
+"""
+
+import queue
+import multiprocessing as mp_proc
+
+# -------------------------
+# Config
+# -------------------------
+MAX_COLA_FRAMES = 64      # ~60 MB a 640x480: unos 2 s de margen a 30 fps
+MAX_COLA_FILAS = 2048
+TIMEOUT_CIERRE_S = 30
+
+
+def _proceso_video(cola, path, fourcc, fps, size):
+    import cv2
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*fourcc), fps, size)
+    try:
+        while True:
+            frame = cola.get()
+            if frame is None:
+                break
+            writer.write(frame)
+    finally:
+        writer.release()
+
+def _proceso_funcion(cola, funcion):
+    while True:
+        args = cola.get()
+        if args is None:
+            break
+        funcion(*args)
+
+
+class _EscritorProceso:
+    def __init__(self, target, args, max_cola, nombre):
+        self.nombre = nombre
+        self.cola = mp_proc.Queue(maxsize=max_cola)
+        self.enviados = 0
+        self.descartados = 0
+        self.perdidos = 0
+        self.max_profundidad = 0
+        self.proceso = mp_proc.Process(target=target, args=(self.cola, *args), name=nombre, daemon=True)
+        self.proceso.start()
+
+    def vivo(self):
+        return self.proceso.is_alive()
+
+    def enviar(self, item):
+        """Encola sin bloquear. Devuelve False si la cola estaba llena (elemento descartado)
+           o si el proceso de fondo ya no está vivo (elemento perdido).
+        """
+        if not self.vivo():
+            if self.perdidos == 0:
+                print(f"AVISO: {self.nombre} terminó inesperadamente (exitcode={self.proceso.exitcode}); "
+                      f"no se escribe nada más.")
+            self.perdidos += 1
+            return False
+        try:
+            self.cola.put_nowait(item)
+        except queue.Full:
+            self.descartados += 1
+            return False
+        self.enviados += 1
+        self.max_profundidad = max(self.max_profundidad, self.profundidad())
+        return True
+
+    def profundidad(self):
+        """Elementos pendientes en la cola (-1 si la plataforma no lo soporta, p. ej. macOS)."""
+        try:
+            return self.cola.qsize()
+        except NotImplementedError:
+            return -1
+
+    def cerrar(self, timeout=TIMEOUT_CIERRE_S):
+        """Espera a que se vacíe la cola y termina el proceso. Nunca bloquea más de ~2*timeout."""
+        if self.vivo():
+            try:
+                self.cola.put(None, timeout=timeout)
+            except queue.Full:
+                print(f"AVISO: {self.nombre} no vació la cola en {timeout}s.")
+            self.proceso.join(timeout)
+        if self.vivo():
+            print(f"AVISO: {self.nombre} no terminó en {timeout}s, se fuerza el cierre.")
+            self.proceso.terminate()
+            self.proceso.join(1)
+        if self.proceso.exitcode != 0:
+            # nadie va a leer lo que quede en la cola: no esperar a volcarlo al salir
+            self.cola.cancel_join_thread()
+            print(f"AVISO: {self.nombre} terminó con exitcode={self.proceso.exitcode}; "
+                  f"parte de lo enviado puede no haberse escrito.")
+
+    def resumen(self):
+        estado = "" if self.proceso.exitcode in (None, 0) else f" CAÍDO (exitcode={self.proceso.exitcode})"
+        return (f"{self.nombre}: enviados={self.enviados} descartados={self.descartados} "
+                f"perdidos={self.perdidos} cola máx={self.max_profundidad}{estado}")
+
+
+class EscritorVideo(_EscritorProceso):
+    def __init__(self, path, fourcc, fps, size, max_cola=MAX_COLA_FRAMES):
+        super().__init__(_proceso_video, (path, fourcc, fps, size), max_cola, "escritor_video")
+
+
+class EscritorFuncion(_EscritorProceso):
+    """`funcion` debe ser una función de nivel de módulo (se envía al proceso por pickle)."""
+
+    def __init__(self, funcion, max_cola=MAX_COLA_FILAS, nombre="escritor_csv"):
+        super().__init__(_proceso_funcion, (funcion,), max_cola, nombre)
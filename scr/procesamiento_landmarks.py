@@ -0,0 +1,143 @@
+"""
+procesamiento_landmarks.py
+Utilidades compartidas para trabajar con vectores de landmarks (21 puntos x,y,z = 63 valores):
+- Normalización igual a la del notebook Limpieza_Landmarks (centrar en muñeca y escalar),
+  en versión por fila y vectorizada por lote.
+- Carga de los splits de dataset_landmarks_limpios y del mapeo label2id.
+- Conversión de los landmarks de MediaPipe a vectores de 63 valores (una o varias manos).
+- Lectura de los CSV crudos de dataset_landmarks y limpieza por z-score.
+"""
+
+import os
+import csv
+import json
+import numpy as np
+
+# -------------------------
+# Config
+# -------------------------
+CLEAN_DIR = "dataset_landmarks_limpios"
+SCALE_BY = "wrist_to_mid"   # mismo valor que en Limpieza_Landmarks.ipynb
+N_LANDMARKS = 21
+N_FEATURES = N_LANDMARKS * 3
+
+# ---------------------- NORMALIZACIÓN ----------------------
+def center_and_scale_vec(vec63, scale_by=SCALE_BY):
+    """Copia de la función del notebook: centra en la muñeca (punto 0) y escala."""
+    pts = np.asarray(vec63).reshape(21, 3).astype(float)
+    wrist = pts[0].copy()
+    centered = pts - wrist
+    if scale_by == 'wrist_to_mid':
+        ref = np.linalg.norm(centered[12])
+    elif scale_by == 'max_dist':
+        ref = np.max(np.linalg.norm(centered, axis=1))
+    else:
+        ref = 1.0
+    if ref == 0 or np.isnan(ref):
+        ref = 1.0
+    scaled = centered / ref
+    return scaled.reshape(63)
+
+def center_and_scale_batch(X, scale_by=SCALE_BY):
+    """Versión vectorizada de center_and_scale_vec para un lote (N,63) -> (N,63) float32."""
+    pts = np.asarray(X, dtype=np.float32).reshape(-1, N_LANDMARKS, 3)
+    centered = pts - pts[:, :1, :]
+    if scale_by == 'wrist_to_mid':
+        ref = np.linalg.norm(centered[:, 12, :], axis=1)
+    elif scale_by == 'max_dist':
+        ref = np.max(np.linalg.norm(centered, axis=2), axis=1)
+    else:
+        ref = np.ones(len(centered), dtype=np.float32)
+    ref = np.where((ref == 0) | np.isnan(ref), 1.0, ref).astype(np.float32)
+    centered /= ref[:, None, None]
+    return centered.reshape(-1, N_FEATURES)
+
+def hand_landmarks_to_vec(hand_landmarks, out=None):
+    """Convierte los landmarks de una mano de MediaPipe a un vector (63,) float32.
+       Si se pasa `out` (vista de 63 valores) se escribe ahí sin reservar memoria nueva.
+    """
+    if out is None:
+        out = np.empty(N_FEATURES, dtype=np.float32)
+    for i, l in enumerate(hand_landmarks.landmark):
+        out[3 * i] = l.x
+        out[3 * i + 1] = l.y
+        out[3 * i + 2] = l.z
+    return out
+
+def pack_hands(multi_hand_landmarks, multi_handedness, out, invertir_lateralidad=False):
+    """Empaqueta todas las manos detectadas en `out` (max_manos, 63), fila i = mano i.
+       Devuelve (n_manos, etiquetas) con etiquetas 'Left'/'Right' por mano.
+       MediaPipe asume imagen espejada al decidir la lateralidad: con la cámara sin espejo
+       hay que invertirla (invertir_lateralidad=True).
+    """
+    n = min(len(multi_hand_landmarks or ()), len(out))
+    etiquetas = []
+    for i in range(n):
+        hand_landmarks_to_vec(multi_hand_landmarks[i], out=out[i])
+        etiqueta = "Unknown"
+        if multi_handedness and i < len(multi_handedness) and multi_handedness[i].classification:
+            etiqueta = multi_handedness[i].classification[0].label
+            if invertir_lateralidad:
+                etiqueta = {"Left": "Right", "Right": "Left"}.get(etiqueta, etiqueta)
+        etiquetas.append(etiqueta)
+    return n, etiquetas
+
+# ---------------------- LIMPIEZA ----------------------
+def remove_outliers_zscore(X, z_thresh=3.5):
+    """Equivalente NumPy de remove_outliers_zscore del notebook (scipy.stats.zscore, ddof=0):
+       descarta filas con algún |z| >= z_thresh. Columnas constantes no descartan nada.
+    """
+    X = np.asarray(X, dtype=np.float32)
+    if len(X) == 0:
+        return X
+    std = X.std(axis=0)
+    z = np.abs((X - X.mean(axis=0)) / np.where(std == 0, 1.0, std))
+    return X[(z < z_thresh).all(axis=1)]
+
+# ---------------------- CARGA DEL DATASET LIMPIO ----------------------
+def load_label2id(clean_dir=CLEAN_DIR):
+    with open(os.path.join(clean_dir, "label2id.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def load_clean_splits(splits=("train", "val"), clean_dir=CLEAN_DIR):
+    """Carga y concatena los splits pedidos (X_<split>.npy / y_<split>.npy).
+       Los splits que no existan en disco se saltan (X_train.npy no se versiona en el repo).
+    """
+    Xs, ys = [], []
+    for split in splits:
+        x_path = os.path.join(clean_dir, f"X_{split}.npy")
+        y_path = os.path.join(clean_dir, f"y_{split}.npy")
+        if not (os.path.exists(x_path) and os.path.exists(y_path)):
+            print(f"AVISO: no se encontró el split '{split}' en {clean_dir}, saltando.")
+            continue
+        Xs.append(np.load(x_path).astype(np.float32))
+        ys.append(np.load(y_path).astype(np.int32))
+    if not Xs:
+        raise FileNotFoundError(f"No se encontró ninguno de los splits {splits} en {clean_dir}.")
+    return np.vstack(Xs), np.concatenate(ys)
+
+# ---------------------- LECTURA DE CSV CRUDOS ----------------------
+def read_landmark_csv(path):
+    """Lee un CSV de dataset_landmarks y devuelve un array (N,63) float32.
+       Misma heurística que el notebook: usa columnas x0,y0,z0..x20,y20,z20 si existen,
+       si no, las últimas 63 columnas. Filas con valores no numéricos o no finitos se descartan.
+    """
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return np.empty((0, N_FEATURES), dtype=np.float32)
+        cols_lower = {c.strip().lower(): i for i, c in enumerate(header)}
+        expected = [f"{c}{i}" for i in range(N_LANDMARKS) for c in ("x", "y", "z")]
+        if all(c in cols_lower for c in expected):
+            idx = [cols_lower[c] for c in expected]
+        else:
+            idx = list(range(len(header) - N_FEATURES, len(header)))
+        rows = []
+        for row in reader:
+            try:
+                rows.append([float(row[i]) for i in idx])
+            except (ValueError, IndexError):
+                continue
+    X = np.asarray(rows, dtype=np.float32).reshape(-1, N_FEATURES)
+    return X[np.isfinite(X).all(axis=1)]
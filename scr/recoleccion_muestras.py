@@ -0,0 +1,166 @@
+"""
+recoleccion_muestras.py
+Recolección de muestras dudosas durante la detección en vivo: los frames donde el clasificador
+no está seguro son justo los que hacen falta para reentrenar.
+
+- Cada mano con probabilidad máxima < umbral se guarda (landmarks crudos, top-k de probabilidades
+  y, opcionalmente, una miniatura recortada de la mano).
+- Las muestras se juntan en lotes y un proceso de fondo (escritura_segundo_plano.py) los escribe en
+  dataset_landmarks_dudosos/<etiqueta_predicha>.csv, con las mismas columnas x0..z20 que
+  dataset_landmarks para poder revisarlas, reetiquetarlas y sumarlas al dataset.
+- Límite de muestras por segundo y colas acotadas: el bucle en vivo nunca espera al disco;
+  si el escritor no da abasto, el lote se descarta y se cuenta.
+"""
+
+import os
+import csv
+import time
+import cv2
+import numpy as np
+
+from escritura_segundo_plano import EscritorFuncion
+
+# -------------------------
+# Config
+# -------------------------
+HARVEST_DIR = "dataset_landmarks_dudosos"
+UMBRAL = 0.60             # se recolecta si la probabilidad máxima es menor
+TOP_K = 3
+MAX_POR_SEGUNDO = 2.0     # ritmo sostenido de muestras (token bucket)
+RAFAGA = 5                # muestras seguidas permitidas antes de aplicar el límite
+TAM_LOTE = 16             # muestras por escritura
+FLUSH_CADA_S = 2.0        # escribir aunque el lote no esté lleno
+MAX_COLA_LOTES = 8
+MINIATURA = (96, 96)
+MARGEN_MINIATURA = 0.25   # margen alrededor de la caja de la mano (fracción del lado)
+
+
+def header_csv(top_k=TOP_K):
+    header = ["time", "capture_type"]
+    for i in range(1, top_k + 1):
+        header += [f"top{i}", f"p{i}"]
+    header += ["thumbnail"]
+    for i in range(21):
+        header += [f"x{i}", f"y{i}", f"z{i}"]
+    return header
+
+def escribir_lote(out_dir, top_k, muestras):
+    """Se ejecuta en el proceso de fondo. muestras: lista de (etiqueta, fila, miniatura|None, nombre_img).
+       Un solo open() por etiqueta y lote.
+    """
+    por_etiqueta = {}
+    for etiqueta, fila, miniatura, nombre_img in muestras:
+        por_etiqueta.setdefault(etiqueta, []).append(fila)
+        if miniatura is not None:
+            img_dir = os.path.join(out_dir, f"{etiqueta}_imgs")
+            os.makedirs(img_dir, exist_ok=True)
+            cv2.imwrite(os.path.join(img_dir, nombre_img), miniatura)
+    os.makedirs(out_dir, exist_ok=True)
+    for etiqueta, filas in por_etiqueta.items():
+        csv_path = os.path.join(out_dir, f"{etiqueta}.csv")
+        nuevo = not os.path.exists(csv_path)
+        with open(csv_path, "a", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if nuevo:
+                writer.writerow(header_csv(top_k))
+            writer.writerows(filas)
+
+def recortar_mano(frame_bgr, vec63, size=MINIATURA, margen=MARGEN_MINIATURA):
+    """Miniatura cuadrada alrededor de los landmarks (coordenadas normalizadas 0..1). Devuelve un array nuevo."""
+    h, w = frame_bgr.shape[:2]
+    pts = np.asarray(vec63).reshape(21, 3)[:, :2] * (w, h)
+    (x0, y0), (x1, y1) = pts.min(axis=0), pts.max(axis=0)
+    lado = max(x1 - x0, y1 - y0) * (1 + 2 * margen)
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    xa, xb = int(max(cx - lado / 2, 0)), int(min(cx + lado / 2, w))
+    ya, yb = int(max(cy - lado / 2, 0)), int(min(cy + lado / 2, h))
+    if xb <= xa or yb <= ya:
+        return None
+    return cv2.resize(frame_bgr[ya:yb, xa:xb], size, interpolation=cv2.INTER_AREA)
+
+
+class RecolectorMuestras:
+    """Uso en el bucle en vivo (una llamada por mano clasificada):
+        recolector.ofrecer(vec_crudo, probs, frame_bgr)
+    y recolector.cerrar() al terminar.
+    """
+
+    def __init__(self, id2label, out_dir=HARVEST_DIR, umbral=UMBRAL, top_k=TOP_K,
+                 max_por_segundo=MAX_POR_SEGUNDO, rafaga=RAFAGA, tam_lote=TAM_LOTE,
+                 flush_cada_s=FLUSH_CADA_S, miniaturas=True):
+        self.id2label = id2label
+        self.out_dir = out_dir
+        self.umbral = umbral
+        self.top_k = top_k
+        self.max_por_segundo = max_por_segundo
+        self.rafaga = rafaga
+        self.tam_lote = tam_lote
+        self.flush_cada_s = flush_cada_s
+        self.miniaturas = miniaturas
+        self.escritor = EscritorFuncion(escribir_lote, max_cola=MAX_COLA_LOTES, nombre="escritor_dudosos")
+
+        self._tokens = float(rafaga)
+        self._t_tokens = time.monotonic()
+        self._t_flush = self._t_tokens
+        self._pendientes = []
+        self._n_img = 0
+        self.candidatos = 0
+        self.recolectados = 0
+        self.limitados = 0
+        self.descartados = 0
+
+    def _hay_token(self, ahora):
+        self._tokens = min(self.rafaga, self._tokens + (ahora - self._t_tokens) * self.max_por_segundo)
+        self._t_tokens = ahora
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    def ofrecer(self, vec_crudo, probs, frame_bgr=None):
+        """Evalúa una mano; si es dudosa (y el límite lo permite) la agrega al lote. Devuelve True si se guardó."""
+        ahora = time.monotonic()
+        if self._pendientes and ahora - self._t_flush >= self.flush_cada_s:
+            self.flush()
+        if probs.max() >= self.umbral:
+            return False
+        self.candidatos += 1
+        if not self._hay_token(ahora):
+            self.limitados += 1
+            return False
+
+        top = np.argsort(probs)[::-1][:self.top_k]
+        etiqueta = str(self.id2label.get(int(top[0]), int(top[0])))
+        miniatura, nombre_img = None, ""
+        if self.miniaturas and frame_bgr is not None:
+            miniatura = recortar_mano(frame_bgr, vec_crudo)
+            if miniatura is not None:
+                self._n_img += 1
+                nombre_img = f"{time.strftime('%Y%m%d_%H%M%S')}_{self._n_img:05d}.jpg"
+
+        fila = [time.strftime("%Y-%m-%d %H:%M:%S"), "dudoso"]
+        for k in top:
+            fila += [self.id2label.get(int(k), int(k)), f"{probs[k]:.4f}"]
+        fila += [nombre_img] + [f"{v:.9f}" for v in np.asarray(vec_crudo).ravel()]
+        self._pendientes.append((etiqueta, fila, miniatura, nombre_img))
+        self.recolectados += 1
+        if len(self._pendientes) >= self.tam_lote:
+            self.flush()
+        return True
+
+    def flush(self):
+        """Envía el lote pendiente al escritor de fondo sin bloquear."""
+        self._t_flush = time.monotonic()
+        if not self._pendientes:
+            return
+        lote, self._pendientes = self._pendientes, []
+        if not self.escritor.enviar((self.out_dir, self.top_k, lote)):
+            self.descartados += len(lote)
+
+    def cerrar(self):
+        self.flush()
+        self.escritor.cerrar()
+
+    def resumen(self):
+        return (f"dudosos={self.candidatos} recolectados={self.recolectados} "
+                f"limitados={self.limitados} descartados={self.descartados} | {self.escritor.resumen()}")
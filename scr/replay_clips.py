@@ -0,0 +1,65 @@
+"""
+replay_clips.py
+Reproducción sin ventana ("headless") de los clips de videos_proc/<LETRA>/ para evaluar
+clasificadores y decodificadores con los mismos landmarks que se verían en vivo.
+
+Cada clip se pasa por MediaPipe Hands en modo video y se entregan, frame a frame,
+los resultados crudos de MediaPipe junto con la etiqueta de la carpeta.
+"""
+
+from pathlib import Path
+import cv2
+import mediapipe as mp
+
+# -------------------------
+# Config
+# -------------------------
+VIDEOS_DIR = "videos_proc"
+VIDEO_EXTS = (".mp4", ".mov", ".mkv", ".avi")
+
+mp_hands = mp.solutions.hands
+
+
+def listar_clips(videos_dir=VIDEOS_DIR):
+    """Devuelve [(letra, ruta_clip), ...] ordenado por carpeta y nombre."""
+    clips = []
+    for letter_folder in sorted(Path(videos_dir).iterdir()):
+        if not letter_folder.is_dir():
+            continue
+        for p in sorted(letter_folder.glob("*")):
+            if p.suffix.lower() in VIDEO_EXTS:
+                clips.append((letter_folder.name, p))
+    return clips
+
+def iterar_frames_clip(video_path, hands, frame_step=1):
+    """Genera (frame_idx, pos_ms, frame_bgr, results) para un clip ya abierto con `hands`."""
+    cap = cv2.VideoCapture(str(video_path))
+    if not cap.isOpened():
+        print("ERROR: no se pudo abrir:", video_path)
+        return
+    frame_idx = 0
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if frame_idx % frame_step == 0:
+                pos_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
+                results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+                yield frame_idx, pos_ms, frame, results
+            frame_idx += 1
+    finally:
+        cap.release()
+
+def iterar_clips(videos_dir=VIDEOS_DIR, frame_step=1, max_num_hands=1,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5):
+    """Genera (letra, ruta_clip, frame_idx, pos_ms, frame_bgr, results) para todos los clips.
+       Se crea un Hands nuevo por clip para que el tracking no se arrastre entre videos.
+    """
+    for letra, clip in listar_clips(videos_dir):
+        with mp_hands.Hands(static_image_mode=False,
+                            max_num_hands=max_num_hands,
+                            min_detection_confidence=min_detection_confidence,
+                            min_tracking_confidence=min_tracking_confidence) as hands:
+            for frame_idx, pos_ms, frame, results in iterar_frames_clip(clip, hands, frame_step):
+                yield letra, clip, frame_idx, pos_ms, frame, results